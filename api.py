@@ -0,0 +1,302 @@
+"""
+Lokalna storitev HTTP/JSON za iskanje po seznamu oseb.
+
+Storitev uporablja isto iskalno jedro kot Streamlit aplikacija (engine.py) in
+en sam Dataset v pomnilniku, ki si ga delijo vse hkratne zahteve (z watcher.py
+se ob novem izvozu zamenja v ozadju). Zahteve sprejema asyncio strežnik brez
+dodatnih odvisnosti; iskanje teče v bazenu niti, da počasna poizvedba ne
+zadrži sprejemanja drugih povezav.
+
+    python api.py [--host 127.0.0.1] [--port 8068]
+
+Končne točke (vse GET, odgovori JSON):
+
+    /search?q=Zobec&column=character&mode=exact&limit=50&offset=0&details=1
+        mode: partial (privzeto), exact, fuzzy (z distance=1 ali 2) ali query
+        (poizvedbeni jezik iz query_language.py, column se ne upošteva);
+        column izpustimo za globalno iskanje; fields=a,b izbere stolpce;
+        year_from/year_to in birth_from/birth_to omejita leto izdaje in rojstva;
+        order: relevance (privzeto, za partial in exact) ali row (vrstni red v seznamu).
+    /federated?q=Zobec&column=character&mode=exact&limit=50
+        zvezno iskanje po vseh virih iz sources.py (le z --federated); zadetki
+        imajo polje source, stanje posameznih virov je v sources.
+    /details/<row>      variacije imen, komentarji in povezava za vrstico
+    /columns            stolpci za iskanje s slovenskimi oznakami
+    /health             različica podatkov in število vrstic
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from engine import RENAME_DICT, details, has_details, search_rows, to_records
+from normalization import normalize_string
+from query_cache import QueryCache
+from query_language import QuerySyntaxError, search_query
+from ranking import rank_rows
+from snapshot import SHEET
+from sources import SOURCES, Federation
+from watcher import DatasetWatcher
+
+logger = logging.getLogger("maj68.api")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+MODES = ("partial", "exact", "fuzzy", "query")
+ORDERS = ("relevance", "row")
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _int(params, name, default, minimum, maximum):
+    value = params.get(name, [None])[0]
+    if value is None or value == "":
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise RequestError(400, f"Parameter {name} mora biti celo število.")
+    if not minimum <= value <= maximum:
+        raise RequestError(400, f"Parameter {name} mora biti med {minimum} in {maximum}.")
+    return value
+
+
+class SearchService:
+    """Odgovori na zahteve nad skupnim Datasetom (brez HTTP podrobnosti)."""
+
+    def __init__(self, watcher, cache, federation=None):
+        self.watcher = watcher
+        self.cache = cache
+        self.federation = federation
+
+    def search(self, params):
+        # Dataset preberemo enkrat, da je odgovor dosleden tudi ob zamenjavi podatkov
+        dataset = self.watcher.dataset
+        query = params.get("q", [""])[0]
+        column = params.get("column", [None])[0] or None
+        mode = params.get("mode", ["partial"])[0]
+        if mode not in MODES:
+            raise RequestError(400, f"Neznan način {mode!r}; možni so {', '.join(MODES)}.")
+        if column is not None and column not in dataset.data.columns:
+            raise RequestError(400, f"Neznan stolpec: {column}")
+        fields = params["fields"][0].split(",") if params.get("fields") else None
+        unknown = [col for col in fields or [] if col not in dataset.data.columns]
+        if unknown:
+            raise RequestError(400, f"Neznani stolpci: {', '.join(unknown)}")
+        limit = _int(params, "limit", DEFAULT_LIMIT, 0, MAX_LIMIT)
+        offset = _int(params, "offset", 0, 0, 2 ** 31)
+        distance = _int(params, "distance", 1, 1, 2) if mode == "fuzzy" else None
+        exact = mode == "exact"
+        order = params.get("order", ["relevance"])[0]
+        if order not in ORDERS:
+            raise RequestError(400, f"Neznano razvrščanje {order!r}; možni sta {', '.join(ORDERS)}.")
+        normalized_query = normalize_string(query)
+
+        if mode == "query":
+            column = None
+            try:
+                rows = search_query(dataset, query, cache=self.cache)
+            except QuerySyntaxError as error:
+                raise RequestError(400, f"Napaka v poizvedbi: {error}")
+        else:
+            rows = search_rows(dataset, query, column, exact, cache=self.cache, distance=distance)
+        # Intervali za številske stolpce (npr. year_from=1968&year_to=1972, birth_to=1919)
+        ranges = {}
+        for col, index in dataset.ranges.items():
+            low = _int(params, f"{col}_from", None, 0, 9999)
+            high = _int(params, f"{col}_to", None, 0, 9999)
+            if low is not None or high is not None:
+                ranges[col] = [low, high]
+                rows = index.filter(rows, low, high)
+        if order == "relevance" and mode in ("partial", "exact"):
+            # Le najboljših offset + limit zadetkov (delno urejanje, glej ranking.py)
+            page = rank_rows(dataset, rows, normalized_query, column, k=offset + limit)[offset:]
+        else:
+            order = "distance" if mode == "fuzzy" else "row"
+            page = rows[offset:offset + limit]
+        records = to_records(dataset, page, fields)
+        with_details = params.get("details", ["0"])[0] not in ("", "0")
+        for row, record in zip(page.tolist(), records):
+            record["row"] = row
+            if with_details:
+                label = dataset.data.index[row]
+                if has_details(dataset, label, normalized_query, column, fuzzy=mode in ("fuzzy", "query")):
+                    record["details"] = details(dataset, label)
+        return {
+            "query": query, "column": column, "mode": mode, "distance": distance, "order": order, "ranges": ranges,
+            "count": len(rows), "offset": offset, "limit": limit,
+            "version": dataset.version, "results": records,
+        }
+
+    def federated(self, params):
+        if self.federation is None:
+            raise RequestError(404, "Zvezno iskanje ni vklopljeno (zaženite z --federated).")
+        query = params.get("q", [""])[0]
+        column = params.get("column", [None])[0] or None
+        mode = params.get("mode", ["partial"])[0]
+        if mode not in ("partial", "exact", "fuzzy"):
+            raise RequestError(400, f"Neznan način {mode!r}; možni so partial, exact, fuzzy.")
+        fields = params["fields"][0].split(",") if params.get("fields") else None
+        limit = _int(params, "limit", DEFAULT_LIMIT, 0, MAX_LIMIT)
+        distance = _int(params, "distance", 1, 1, 2) if mode == "fuzzy" else None
+        count, records = self.federation.search_records(
+            query, column, mode == "exact", distance, limit=limit, fields=fields,
+        )
+        return {
+            "query": query, "column": column, "mode": mode, "distance": distance, "count": count, "limit": limit,
+            "sources": self.federation.status(), "results": records,
+        }
+
+    def details(self, row):
+        dataset = self.watcher.dataset
+        try:
+            row = int(row)
+        except ValueError:
+            raise RequestError(400, "Številka vrstice mora biti celo število.")
+        if not 0 <= row < len(dataset.data):
+            raise RequestError(404, f"Vrstica {row} ne obstaja.")
+        return dict(details(dataset, dataset.data.index[row]), row=row, version=dataset.version)
+
+    def columns(self):
+        dataset = self.watcher.dataset
+        return {"columns": [{"column": col, "label": RENAME_DICT.get(col, col)} for col in dataset.valid_columns]}
+
+    def health(self):
+        dataset = self.watcher.dataset
+        return {
+            "version": dataset.version, "source": os.path.basename(dataset.source),
+            "rows": len(dataset.data), "cache": self.cache.stats(),
+        }
+
+    def handle(self, method, target):
+        """Vrne (status, telo) za zahtevo."""
+        if method != "GET":
+            raise RequestError(405, "Podprta je le metoda GET.")
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        path = url.path.rstrip("/") or "/"
+        if path == "/search":
+            return 200, self.search(params)
+        if path == "/federated":
+            return 200, self.federated(params)
+        if path.startswith("/details/"):
+            return 200, self.details(unquote(path[len("/details/"):]))
+        if path == "/columns":
+            return 200, self.columns()
+        if path == "/health":
+            return 200, self.health()
+        raise RequestError(404, f"Neznana pot: {url.path}")
+
+
+class Server:
+    """Minimalen HTTP/1.1 strežnik (GET, keep-alive) nad asyncio."""
+
+    def __init__(self, service, workers=4):
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="maj68-api")
+
+    async def respond(self, method, target):
+        loop = asyncio.get_running_loop()
+        try:
+            status, body = await loop.run_in_executor(self.executor, self.service.handle, method, target)
+        except RequestError as error:
+            status, body = error.status, {"error": str(error)}
+        except Exception:
+            logger.exception("Napaka pri obdelavi %s %s", method, target)
+            status, body = 500, {"error": "Notranja napaka strežnika."}
+        return status, json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # Brez veljavne dolžine telesa ne vemo, kje se začne naslednja zahteva
+                    status, body = 400, json.dumps({"error": "Neveljavna glava Content-Length."}).encode("utf-8")
+                    keep_alive = False
+                else:
+                    # Telo zahteve (če obstaja) preberemo in zavržemo
+                    if length:
+                        await reader.readexactly(length)
+                    keep_alive = (
+                        headers.get("connection", "").lower() != "close"
+                        if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive"
+                    )
+                    status, body = await self.respond(method, target)
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        logger.info("Storitev posluša na http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8068)
+    parser.add_argument("--directory", default=".", help="mapa z izvozi LIST_type=person_<datum>-iskalnik.xlsx")
+    parser.add_argument("--sheet", default=SHEET, help="delovni list")
+    parser.add_argument("--compact", action="store_true", help="kompaktna predstavitev podatkov v pomnilniku")
+    parser.add_argument("--reload-interval", type=int, default=60, help="preverjanje novih izvozov (s), 0 izklopi")
+    parser.add_argument("--workers", type=int, default=4, help="niti za iskanje")
+    parser.add_argument("--federated", action="store_true", help="vklopi /federated (vsi viri iz sources.py)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    watcher = DatasetWatcher(args.directory, sheet=args.sheet, compact=args.compact, interval=args.reload_interval)
+    federation = None
+    if args.federated:
+        # Glavni vir je že naložen; druge delčke naložimo v ozadju, ko storitev že sprejema zahteve
+        federation = Federation(
+            SOURCES, args.directory, args.compact, args.reload_interval, watchers={SOURCES[0].name: watcher},
+        )
+    service = SearchService(watcher.start(), QueryCache(max_entries=1024, max_bytes=64 * 1024 * 1024), federation)
+    if federation is not None:
+        federation.start()
+    try:
+        asyncio.run(Server(service, args.workers).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Predlogi za samodejno dopolnjevanje poizvedbe.
+
+Za vsak stolpec (in globalno za vse skupaj) hranimo urejen seznam unikatnih
+normaliziranih vrednosti s pogostostjo v korpusu in najpogostejšo izvirno
+obliko za prikaz. Predpona poizvedbe z bisekcijo določi obseg ujemajočih se
+vrednosti, iz njega pa z np.argpartition izberemo N najpogostejših, zato je
+poizvedba hitra tudi za kratke predpone.
+"""
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from normalization import normalize_string
+
+# Znak, večji od vseh drugih, za zgornjo mejo obsega predpone
+_MAX_CHAR = "\U0010ffff"
+
+
+class _SortedValues:
+    """Urejene normalizirane vrednosti z vzporednimi polji prikaza, stolpca in pogostosti."""
+
+    def __init__(self, entries):
+        entries = entries.sort_values(["normalized", "column"], kind="stable")
+        self.keys = entries["normalized"].tolist()
+        self.display = entries["display"].tolist()
+        self.columns = entries["column"].tolist()
+        self.counts = entries["count"].to_numpy(dtype=np.int64)
+
+    def prefix(self, normalized_prefix, limit):
+        lo = bisect_left(self.keys, normalized_prefix)
+        hi = bisect_left(self.keys, normalized_prefix + _MAX_CHAR, lo)
+        if hi - lo > limit:
+            # Le N najpogostejših iz obsega, nato jih uredimo
+            top = lo + np.argpartition(-self.counts[lo:hi], limit - 1)[:limit]
+        else:
+            top = np.arange(lo, hi)
+        # Po pogostosti padajoče, ob enakosti po abecedi (indeks v urejenem seznamu)
+        top = top[np.lexsort((top, -self.counts[top]))]
+        return [(self.display[i], self.columns[i], int(self.counts[i])) for i in top]
+
+
+def column_entries(dataframe, normalized, column):
+    """Unikatne normalizirane vrednosti stolpca s pogostostjo in najpogostejšo izvirno obliko."""
+    present = dataframe[column].notna()
+    pairs = pd.DataFrame({
+        "normalized": normalized[column][present].astype(str).to_numpy(),
+        "display": dataframe[column][present].astype(str).to_numpy(),
+    })
+    forms = pairs.value_counts(sort=True).reset_index(name="form_count")
+    entries = forms.groupby("normalized", sort=False).agg(
+        display=("display", "first"), count=("form_count", "sum")
+    ).reset_index()
+    entries["column"] = column
+    return entries[entries["normalized"] != ""]
+
+
+class Autocomplete:
+    def __init__(self, dataframe, normalized, columns):
+        entries = {col: column_entries(dataframe, normalized, col) for col in columns}
+        self._columns = {col: _SortedValues(frame) for col, frame in entries.items()}
+        self._global = _SortedValues(pd.concat(entries.values(), ignore_index=True))
+
+    def suggest(self, query, column=None, limit=10):
+        """Vrne do `limit` predlogov (prikaz, stolpec, pogostost) za predpono poizvedbe.
+
+        Predlogi so urejeni po pogostosti v korpusu; z `column` iščemo le v tem stolpcu.
+        """
+        normalized_query = normalize_string(query)
+        if not normalized_query or limit <= 0:
+            return []
+        values = self._columns[column] if column else self._global
+        return values.prefix(normalized_query, limit)
@@ -0,0 +1,169 @@
+"""
+Paketno iskanje po seznamu oseb iz ukazne vrstice.
+
+Vsaka neprazna vrstica vhodne datoteke je ena poizvedba: navaden niz ali
+objekt JSON {"query": ..., "column": ..., "exact": ..., "distance": ...}, ki za to poizvedbo
+povozi privzete nastavitve. Poizvedbe se razdelijo med procese (vsak naloži
+podatke enkrat), rezultati pa se v vhodnem vrstnem redu zapišejo kot JSON Lines:
+
+    {"query": "Zobec", "column": "character", "exact": true, "count": 42, "results": [{...}, ...]}
+
+Neveljavna vrstica (npr. pokvarjen JSON, brez "query", z "exact", ki ni true
+ali false, ali z neveljavno razdaljo) ne ustavi izvajanja: zanjo se zapiše
+zapis s poljem "error".
+
+Primer:
+
+    python batch_search.py poizvedbe.txt -o rezultati.jsonl --column character --exact --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+from engine import load_dataset, search_rows, to_records
+from fuzzy import MAX_DISTANCE
+from snapshot import SHEET, SOURCE
+from sqlite_backend import load_sqlite
+
+# Podatki v posameznem procesu (naloženi enkrat, v inicializatorju)
+_dataset = None
+_options = None
+
+
+def _init_worker(source, sheet, compact, options, backend="memory"):
+    global _dataset, _options
+    if _dataset is None:
+        if backend == "sqlite":
+            # Procesi si delijo datoteko baze (prek predpomnilnika OS), ne kopij tabele
+            _dataset = load_sqlite(source, sheet)
+        else:
+            _dataset = load_dataset(source, sheet, compact=compact)
+    _options = options
+
+
+def _distance(value):
+    """Razdalja iz vhoda kot int od 1 do MAX_DISTANCE (tudi iz niza, npr. "2") ali None."""
+    if value is None:
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_DISTANCE:
+        raise ValueError(f"neveljavna razdalja {value!r} (dovoljeno od 1 do {MAX_DISTANCE})")
+    return value
+
+
+def _exact(value):
+    """Natančno ujemanje iz vhoda; le true ali false (niz "false" bi bil sicer resničen)."""
+    if not isinstance(value, bool):
+        raise ValueError(f"neveljavna vrednost 'exact' {value!r} (dovoljeno true ali false)")
+    return value
+
+
+def parse_line(line, column=None, exact=False, distance=None):
+    """Vrne (poizvedba, stolpec, natančno, razdalja, napaka) iz vrstice vhodne datoteke ali None za prazno vrstico.
+
+    Napaka je None ali opis, zakaj vrstice ni mogoče prebrati (poizvedba je
+    tedaj vsa vrstica).
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            job = json.loads(line)
+            if job.get("query") is None:
+                raise ValueError("manjka polje 'query'")
+            job_column = job.get("column", column)
+            if job_column is not None and not isinstance(job_column, str):
+                raise ValueError(f"neveljaven stolpec {job_column!r}")
+            return (
+                str(job["query"]), job_column, _exact(job.get("exact", exact)), _distance(job.get("distance", distance)),
+                None,
+            )
+        except ValueError as error:
+            # Tudi json.JSONDecodeError je ValueError
+            return line, column, exact, distance, f"Neveljavna vrstica: {error}"
+    return line, column, exact, distance, None
+
+
+def answer(job):
+    """Odgovori na eno poizvedbo in vrne zapis JSON (kot niz)."""
+    query, column, exact, distance, error = job
+    record = {"query": query, "column": column, "exact": exact}
+    if distance is not None:
+        record["distance"] = distance
+    if error is not None:
+        record["error"] = error
+        return json.dumps(record, ensure_ascii=False)
+    if column is not None and column not in _dataset.columns:
+        record["error"] = f"Neznan stolpec: {column}"
+        return json.dumps(record, ensure_ascii=False)
+    try:
+        rows = search_rows(_dataset, query, column, exact, distance=distance)
+    except ValueError as error:
+        record["error"] = str(error)
+        return json.dumps(record, ensure_ascii=False)
+    record["count"] = len(rows)
+    limit = _options["limit"]
+    record["results"] = to_records(_dataset, rows if limit is None else rows[:limit], _options["fields"])
+    return json.dumps(record, ensure_ascii=False)
+
+
+def read_jobs(path, column, exact, distance):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            job = parse_line(line, column, exact, distance)
+            if job is not None:
+                yield job
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", help="datoteka s poizvedbami (ena na vrstico)")
+    parser.add_argument("-o", "--output", help="izhodna datoteka JSON Lines (privzeto standardni izhod)")
+    parser.add_argument("--column", help="stolpec za iskanje (privzeto globalno iskanje)")
+    parser.add_argument("--exact", action="store_true", help="natančno ujemanje namesto delnega")
+    parser.add_argument("--distance", type=int, help="približno ujemanje z največ toliko napakami (1 ali 2)")
+    parser.add_argument("--limit", type=int, help="največ toliko vrstic na poizvedbo (število zadetkov je vedno točno)")
+    parser.add_argument("--fields", help="stolpci v rezultatih, ločeni z vejico (privzeto prikazani stolpci)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="število procesov")
+    parser.add_argument("--chunksize", type=int, default=64, help="poizvedb na paket za posamezen proces")
+    parser.add_argument("--source", default=SOURCE, help="izvorna datoteka .xlsx")
+    parser.add_argument("--sheet", default=SHEET, help="delovni list")
+    parser.add_argument("--compact", action="store_true", help="kompaktna predstavitev podatkov v pomnilniku")
+    parser.add_argument(
+        "--backend", choices=["memory", "sqlite"], default="memory",
+        help="iskanje v pomnilniku ali v skupni bazi SQLite (glej sqlite_backend.py; brez približnega ujemanja)",
+    )
+    args = parser.parse_args(argv)
+
+    options = {"limit": args.limit, "fields": args.fields.split(",") if args.fields else None}
+    # Podatke naložimo najprej v glavnem procesu: tako se posnetek po potrebi zgradi
+    # le enkrat, pri zagonu s fork pa ga procesi podedujejo.
+    _init_worker(args.source, args.sheet, args.compact, options, args.backend)
+    unknown = [col for col in [args.column] + (options["fields"] or []) if col and col not in _dataset.columns]
+    if unknown:
+        parser.error(f"neznani stolpci: {', '.join(unknown)}")
+
+    jobs = read_jobs(args.queries, args.column, args.exact, args.distance)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.workers <= 1:
+            for line in map(answer, jobs):
+                out.write(line + "\n")
+        else:
+            with multiprocessing.Pool(
+                args.workers, initializer=_init_worker,
+                initargs=(args.source, args.sheet, args.compact, options, args.backend),
+            ) as pool:
+                for line in pool.imap(answer, jobs, chunksize=args.chunksize):
+                    out.write(line + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
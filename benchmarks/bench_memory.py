@@ -0,0 +1,76 @@
+"""
+Poraba pomnilnika celotnega procesa v običajnem in kompaktnem načinu.
+
+Vsak način izmeri v svojem procesu: naloži Dataset (load_dataset), zgradi še
+lene strukture (približno ujemanje, predloge, entitete, kot jih zgradi
+watcher) in izpiše porast RSS procesa, kopico Pythona (tracemalloc) ter
+podatke s senčnimi stolpci (snapshot.memory_usage). RSS vključuje tudi v
+pomnilnik preslikani posnetek, tracemalloc pa ne vidi pomnilnika Arrow.
+
+    python -m benchmarks.bench_memory [--source DATOTEKA.xlsx] [--sheet LIST]
+"""
+import argparse
+import gc
+import json
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+from engine import load_dataset
+from snapshot import SHEET, SOURCE, load_snapshot, memory_usage
+
+
+def rss_mb():
+    """Trenutni RSS procesa v MB (na sistemih brez /proc največji dosedanji)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1e3
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def measure(source, sheet, compact):
+    # Posnetek naj bo svež že pred meritvijo, da ne merimo branja Excela
+    load_snapshot(source, sheet)
+    gc.collect()
+    before = rss_mb()
+    tracemalloc.start()
+    dataset = load_dataset(source, sheet, compact=compact)
+    dataset.fuzzy_index
+    dataset.autocomplete
+    dataset.entities
+    gc.collect()
+    return {
+        "rss_mb": rss_mb() - before,
+        "heap_mb": tracemalloc.get_traced_memory()[0] / 1e6,
+        "frames_mb": memory_usage(dataset.data, dataset.normalized) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--sheet", default=SHEET)
+    parser.add_argument("--child", choices=["normal", "compact"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.source, args.sheet, args.child == "compact")))
+        return
+    print(f"{'način':<10}{'RSS':>10}{'kopica':>10}{'podatki':>10}")
+    for mode in ("normal", "compact"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_memory", "--source", args.source, "--sheet", args.sheet,
+             "--child", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f"{mode:<10}" + "".join(f"{result[key]:>8.1f}MB" for key in ("rss_mb", "heap_mb", "frames_mb")))
+
+
+if __name__ == "__main__":
+    main()
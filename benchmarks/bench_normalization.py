@@ -0,0 +1,60 @@
+"""
+Mikro-primerjava normalizacije stolpcev.
+
+Primerja dosedanji pristop (normalize_string za vsako celico prek .map) z
+normalize_series (vsaka unikatna vrednost enkrat, tabela znakov namesto NFKD)
+na vseh stolpcih seznama oseb in preveri, da sta rezultata enaka.
+
+    python -m benchmarks.bench_normalization [--source DATOTEKA.xlsx] [--sheet LIST] [--repeat N]
+"""
+import argparse
+import timeit
+
+import pandas as pd
+
+from normalization import normalize_series, normalize_string, normalize_value
+from snapshot import SHEET, SOURCE, load_snapshot
+
+
+def per_cell(series):
+    return series.map(lambda value: normalize_string(str(value)))
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--sheet", default=SHEET)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df, _ = load_snapshot(args.source, args.sheet)
+    print(f"{len(df)} vrstic, {len(df.columns)} stolpcev, najboljši od {args.repeat} ponovitev\n")
+    print(f"{'stolpec':<14} {'unikatnih':>9} {'po celicah':>12} {'vektorsko':>12} {'pohitritev':>10}")
+
+    total_old = total_new = 0.0
+    for col in df.columns:
+        series = df[col]
+        old = per_cell(series)
+        new = normalize_series(series)
+        assert old.astype(object).equals(new.astype(object)), f"Razlika v stolpcu {col!r}"
+        t_old = best_of(lambda: per_cell(series), args.repeat)
+        t_new = best_of(lambda: normalize_series(series), args.repeat)
+        total_old += t_old
+        total_new += t_new
+        print(f"{col:<14} {series.nunique(dropna=False):>9} {t_old * 1e3:>10.2f}ms {t_new * 1e3:>10.2f}ms {t_old / t_new:>9.1f}x")
+    print(f"{'skupaj':<14} {'':>9} {total_old * 1e3:>10.2f}ms {total_new * 1e3:>10.2f}ms {total_old / total_new:>9.1f}x")
+
+    # Čista primerjava funkcij na unikatnih vrednostih (brez učinka faktorizacije)
+    uniques = pd.unique(df.astype(str).to_numpy().ravel()).tolist()
+    t_old = best_of(lambda: [normalize_string(value) for value in uniques], args.repeat)
+    t_new = best_of(lambda: [normalize_value(value) for value in uniques], args.repeat)
+    print(f"\n{len(uniques)} unikatnih nizov: normalize_string {t_old * 1e3:.2f}ms, "
+          f"normalize_value {t_new * 1e3:.2f}ms ({t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Dopolnjevanje poizvedbe med tipkanjem: preverjanje in meritev refine_search.
+
+Simulira tipkanje vzorčnih vrednosti iz korpusa znak za znakom (tudi z
+brisanjem zadnjega znaka in s pisanjem na začetek), globalno in po poljih, ter
+za vsak korak preveri, da refine_search (ki nadaljuje s prejšnjim rezultatom)
+vrne iste vrstice kot iskanje po vseh podatkih (match_rows). Ob razliki se
+ustavi z napako, sicer izpiše čase obeh načinov.
+
+    python -m benchmarks.bench_refine [--source DATOTEKA.xlsx] [--sheet LIST] [--chains N] [--seed S]
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine import load_dataset, match_rows, refine_search
+from normalization import normalize_string
+from snapshot import SHEET, SOURCE
+
+# Stolpci, iz katerih vzorčimo vrednosti, in stolpci za iskanje po polju
+QUERY_COLUMNS = ["character", "lemma", "surface", "author", "title_(year)"]
+FIELD_COLUMNS = [None, "character", "author", "title_(year)"]
+
+
+def typing_chains(df, count, seed):
+    """Zaporedja poizvedb, kot nastanejo med tipkanjem (s popravki)."""
+    rng = np.random.default_rng(seed)
+    values = [value for value in pd.unique(df[QUERY_COLUMNS].astype(str).to_numpy().ravel()) if value != "nan"]
+    chains = []
+    for value in rng.choice(values, size=count):
+        value = value[:12]
+        chain = [value[:i] for i in range(1, len(value) + 1)]
+        if len(value) > 2:
+            # Brisanje zadnjega znaka in ponovno tipkanje
+            chain += [value[:-1], value]
+            # Pisanje pred že vpisanim besedilom ("ar" -> "mar")
+            chain += [value[1:], value]
+        chains.append(chain)
+    return chains
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=SOURCE)
+    parser.add_argument("--sheet", default=SHEET)
+    parser.add_argument("--chains", type=int, default=200, help="število vzorčnih zaporedij tipkanja")
+    parser.add_argument("--seed", type=int, default=68)
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.source, args.sheet)
+    chains = typing_chains(dataset.data, args.chains, args.seed)
+    full_times, refine_times = [], []
+    steps = refined = 0
+    for column in FIELD_COLUMNS:
+        for chain in chains:
+            previous = None
+            for query in chain:
+                start = time.perf_counter()
+                expected = match_rows(dataset, normalize_string(query), column)
+                full_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                state = refine_search(dataset, query, column, previous)
+                refine_times.append(time.perf_counter() - start)
+                if not np.array_equal(state["rows"], expected):
+                    sys.exit(f"Razlika pri poizvedbi {query!r} (stolpec {column}, prejšnja {previous and previous['query']!r})")
+                steps += 1
+                refined += previous is not None and previous["query"] in state["query"]
+                previous = state
+
+    print(f"{steps} korakov tipkanja ({refined} nadaljevanih), rezultati enaki")
+    for name, samples in (("vse vrstice", full_times), ("dopolnjevanje", refine_times)):
+        print(f"{name:<14} skupaj {sum(samples) * 1e3:>9.1f}ms  povprečje {statistics.fmean(samples) * 1e3:.3f}ms")
+    print(f"pohitritev {sum(full_times) / sum(refine_times):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Meritve celotne poti na sintetičnih korpusih različnih velikosti.
+
+Za vsako velikost (glej benchmarks/synthetic.py) izmeri: branje Excela,
+predobdelavo, normalizacijo, zapis in branje posnetka, izgradnjo indeksov
+(Dataset), iskanje (globalno/po polju × delno/natančno; p50, p95, povprečje)
+in pripravo podrobnosti za razširljive razdelke ter porabo pomnilnika.
+Rezultati se shranijo v benchmarks/results/bench-<čas>.json, da lahko
+primerjamo zagone:
+
+    python -m benchmarks.bench_suite --sizes 10000,100000,1000000
+    python -m benchmarks.bench_suite --sizes 10000 --compare benchmarks/results/bench-20260101-120000.json
+
+Z --skip-excel se korpus ustvari neposredno v pomnilniku (brez zapisa in
+branja .xlsx), kar pri milijonu vrstic prihrani več minut.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import ensure_workbook, generate
+from engine import Dataset, details, has_details, search_rows
+from normalization import normalize_string
+from snapshot import SHEET, memory_usage, normalize_frame, preprocess, read_snapshot, write_snapshot
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Stolpci, iz katerih vzorčimo poizvedbe, in stolpci za iskanje po polju
+QUERY_COLUMNS = ["character", "lemma", "surface", "author", "title_(year)"]
+FIELD_COLUMNS = ["character", "author", "title_(year)"]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def summary(samples):
+    """p50, p95 in povprečje v milisekundah."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "p50_ms": ordered[len(ordered) // 2] * 1e3,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+    }
+
+
+def sample_queries(df, count, seed):
+    """Vzorec poizvedb iz korpusa: cele vrednosti (natančno) in podnizi dolžine 2–6 (delno)."""
+    rng = np.random.default_rng(seed)
+    values = pd.unique(df[QUERY_COLUMNS].astype(str).to_numpy().ravel())
+    values = [value for value in values if value != "nan"]
+    whole = [str(values[i]) for i in rng.integers(len(values), size=count)]
+    parts = []
+    for value in whole:
+        length = int(rng.integers(2, 7))
+        start = int(rng.integers(max(1, len(value) - length + 1)))
+        parts.append(value[start:start + length])
+    return whole, parts
+
+
+def bench_searches(dataset, whole, parts):
+    cases = {}
+    for mode, column in [("global", None)] + [(f"field:{col}", col) for col in FIELD_COLUMNS]:
+        for exact, queries in [(True, whole), (False, parts)]:
+            samples = [timed(search_rows, dataset, query, column, exact)[1] for query in queries]
+            cases[f"{mode}:{'exact' if exact else 'partial'}"] = summary(samples)
+    return cases
+
+
+def bench_details(dataset, parts, limit):
+    """Čas priprave razširljivih razdelkov za prvo stran zadetkov globalnega iskanja."""
+    samples = []
+    for query in parts:
+        start = time.perf_counter()
+        normalized_query = normalize_string(query)
+        page = dataset.data.iloc[search_rows(dataset, query)[:limit]]
+        for label in page.index[~page["text_id"].duplicated()]:
+            if has_details(dataset, label, normalized_query):
+                details(dataset, label)
+        samples.append(time.perf_counter() - start)
+    return summary(samples)
+
+
+def bench_size(rows, args):
+    stages = {}
+    if args.skip_excel:
+        raw, stages["generate_s"] = timed(generate, rows, args.seed)
+    else:
+        path = ensure_workbook(rows, args.seed)
+        raw, stages["read_excel_s"] = timed(pd.read_excel, path, sheet_name=SHEET)
+    df, stages["preprocess_s"] = timed(preprocess, raw)
+    normalized, stages["normalize_s"] = timed(normalize_frame, df)
+
+    source = os.path.join(args.workdir, f"synthetic-{rows}-seed{args.seed}.xlsx")
+    _, stages["write_snapshot_s"] = timed(write_snapshot, source, df, normalized, {"sha256": f"synthetic-{rows}"})
+    (df, normalized), stages["read_snapshot_s"] = timed(read_snapshot, source)
+    df.attrs["version"] = f"synthetic-{rows}"
+    dataset, stages["build_indexes_s"] = timed(Dataset, df, normalized)
+
+    whole, parts = sample_queries(df, args.queries, args.seed)
+    return {
+        "rows": rows,
+        "texts": int(df["text_id"].nunique()),
+        "memory_mb": memory_usage(df, normalized) / 1e6,
+        "stages": stages,
+        "search": bench_searches(dataset, whole, parts),
+        "details": bench_details(dataset, parts[:max(1, args.queries // 5)], args.page_size),
+    }
+
+
+def compare(current, previous):
+    """Izpiše razmerja (zdaj / prej) za skupne velikosti in meritve."""
+    old = {result["rows"]: result for result in previous["results"]}
+    for result in current["results"]:
+        before = old.get(result["rows"])
+        if before is None:
+            continue
+        print(f"\n{result['rows']} vrstic: zdaj / prej")
+        for stage, value in result["stages"].items():
+            if stage in before["stages"]:
+                print(f"  {stage:<28} {value:>9.3f}s {before['stages'][stage]:>9.3f}s {value / before['stages'][stage]:>6.2f}x")
+        for case, stats in list(result["search"].items()) + [("details", result["details"])]:
+            prev = before["search"].get(case) if case != "details" else before["details"]
+            if prev:
+                print(f"  {case + ' p50':<28} {stats['p50_ms']:>8.3f}ms {prev['p50_ms']:>8.3f}ms "
+                      f"{stats['p50_ms'] / max(prev['p50_ms'], 1e-9):>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="velikosti korpusa, ločene z vejico")
+    parser.add_argument("--seed", type=int, default=68)
+    parser.add_argument("--queries", type=int, default=200, help="poizvedb na način iskanja")
+    parser.add_argument("--page-size", type=int, default=50, help="zadetkov na stran za razširljive razdelke")
+    parser.add_argument("--skip-excel", action="store_true", help="ne piši in ne beri .xlsx")
+    parser.add_argument("--workdir", default=os.path.join(os.path.dirname(__file__), "data"), help="mapa za posnetke")
+    parser.add_argument("--output", help="datoteka z rezultati (privzeto benchmarks/results/bench-<čas>.json)")
+    parser.add_argument("--compare", help="prejšnja datoteka z rezultati za primerjavo")
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+    report = {
+        "started": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "args": vars(args),
+        "results": [],
+    }
+    for rows in [int(size) for size in args.sizes.split(",")]:
+        result = bench_size(rows, args)
+        report["results"].append(result)
+        stages = ", ".join(f"{stage} {value:.3f}s" for stage, value in result["stages"].items())
+        print(f"{rows} vrstic ({result['texts']} besedil, {result['memory_mb']:.1f} MB): {stages}")
+        for case, stats in list(result["search"].items()) + [("details", result["details"])]:
+            print(f"  {case:<28} p50 {stats['p50_ms']:>8.3f}ms  p95 {stats['p95_ms']:>8.3f}ms  "
+                  f"povprečje {stats['mean_ms']:>8.3f}ms")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"bench-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nRezultati: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
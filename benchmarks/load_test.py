@@ -0,0 +1,114 @@
+"""
+Obremenitveni test lokalne storitve (api.py).
+
+Odpre `--connections` hkratnih povezav (keep-alive) in po njih pošilja zahteve
+/search s poizvedbami iz datoteke (ena na vrstico) ali iz vgrajenega nabora,
+dokler ne poteče `--duration` sekund. Izpiše prepustnost (zahtev/s), število
+napak in zakasnitve (p50, p95, p99, največja).
+
+    python api.py &
+    python -m benchmarks.load_test --connections 32 --duration 20 [--queries poizvedbe.txt] [--mode exact]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from urllib.parse import urlencode
+
+from timing import percentile
+
+QUERIES = [
+    "Zobec", "zob", "Ivo", "Suhodolčan", "Janez", "Marija", "novak", "ana", "Kovač", "Tribuna",
+    "drama", "gospa", "Zupančič", "Šalamun", "oče", "poezija", "Rupel", "mati", "Ljubljana", "Kocbek",
+]
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host, port, targets, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            target = next(targets)
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            status, body = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append((status, body[:200]))
+    finally:
+        writer.close()
+
+
+async def run(args, queries):
+    params = {"limit": args.limit, "mode": args.mode}
+    if args.column:
+        params["column"] = args.column
+    if args.details:
+        params["details"] = 1
+    targets = itertools.cycle([f"/search?{urlencode(dict(params, q=query))}" for query in queries])
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        client(args.host, args.port, targets, deadline, latencies, errors) for _ in range(args.connections)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8068)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="trajanje testa v sekundah")
+    parser.add_argument("--queries", help="datoteka s poizvedbami (ena na vrstico)")
+    parser.add_argument("--mode", default="partial", choices=["partial", "exact", "fuzzy", "query"])
+    parser.add_argument("--column", help="stolpec za iskanje (privzeto globalno iskanje)")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--details", action="store_true", help="zahtevaj tudi podrobnosti zadetkov")
+    parser.add_argument("--json", action="store_true", help="rezultat izpiši kot JSON")
+    args = parser.parse_args()
+
+    queries = QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    latencies, errors, elapsed = asyncio.run(run(args, queries))
+    ordered = sorted(latencies) or [0.0]
+    report = {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.5) * 1e3, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1e3, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1e3, 3),
+        "max_ms": round(ordered[-1] * 1e3, 3),
+    }
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"{report['requests']} zahtev v {report['seconds']} s ({args.connections} povezav): "
+              f"{report['throughput_rps']} zahtev/s, napak {report['errors']}")
+        print(f"zakasnitev: p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+              f"p99 {report['p99_ms']} ms, največ {report['max_ms']} ms")
+    for status, body in errors[:5]:
+        print(f"  napaka {status}: {body.decode('utf-8', 'replace')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Generator sintetičnih seznamov oseb za meritve.
+
+Ustvari delovni zvezek z enako shemo kot LIST_type=person_2025-02-12-iskalnik.xlsx
+(#, title_(year), text_id, author, publication, gender, subtype, type, id, birth,
+text_type, year, surface, lemma, character, comment, real_char, real_link) in s
+podobnimi razmerji: približno 30 vrstic na besedilo, nekaj likov na besedilo,
+sklonjene oblike imen v 'surface', redki komentarji s 'real_char' in povezave
+na Wikipedijo. Imena vsebujejo slovenske diakritične znake (č, š, ž, ć, đ).
+
+    python -m benchmarks.synthetic 100000 [--seed 68] [--output pot.xlsx]
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+MALE_NAMES = [
+    "Janez", "Franc", "Jože", "Ivan", "Anton", "Marko", "Tomaž", "Matjaž", "Aleš", "Bojan", "Žiga", "Rožle",
+    "Štefan", "Drago", "Primož", "Boštjan", "Gašper", "Urh", "Lovro", "Vid", "Dušan", "Miško", "Radoš",
+    "Valerij", "Dimitrij", "Luka", "Ciril", "Metod", "Andrej", "Peter", "Ludvik", "Srečko",
+]
+FEMALE_NAMES = [
+    "Ana", "Marija", "Frančiška", "Neža", "Špela", "Zdenka", "Ljudmila", "Nataša", "Milena", "Jožica", "Urška",
+    "Mojca", "Tjaša", "Katarina", "Alenka", "Živa", "Vesna", "Barbara", "Majda", "Helena", "Danica", "Gretica",
+]
+SURNAMES = [
+    "Novak", "Horvat", "Kovačič", "Krajnc", "Zupančič", "Potočnik", "Kovač", "Mlakar", "Vidmar", "Golob", "Turk",
+    "Božič", "Kos", "Vovk", "Kolar", "Žagar", "Šuštar", "Jerič", "Čebular", "Pečnik", "Zobec", "Zemljič",
+    "Medved", "Hribar", "Kavčič", "Rupel", "Šalamun", "Pirih", "Zadnikar", "Tomažič", "Đurić", "Petrović",
+    "Kranjec", "Suhodolčan", "Strniša", "Ćosić", "Šeligo", "Jančar", "Zajc", "Kocbek",
+]
+ROLES = [
+    "natakarica", "gospa", "žena", "mož", "profesor", "učitelj", "duhovnik", "kmet", "delavec", "mati", "oče",
+    "sestra", "brat", "zdravnik", "šofer", "stražnik", "kuharica", "župnik", "tovariš", "sosed", "dekle",
+]
+TITLE_WORDS = [
+    "pês", "prókleti", "dolina", "neštetih", "radosti", "plošča", "slovenska", "kerubini", "življenje",
+    "podeželskih", "plejbojev", "česen", "mlatit", "korotan", "prijateljsko", "prepričevanje", "navzven",
+    "pernastici", "kronika", "interna", "tragična", "komedija", "možgani", "garantirani", "večer", "ječa",
+    "zgodba", "ulica", "mesto", "reka", "ljubezen", "smrt", "pesem", "tišina", "žalost", "čas", "šola",
+]
+SUBTITLES = ["Tretje poglavje", "Drama v treh dejanjih", "Kdo vse so kradli", "Vsebina filma", "Epilog"]
+PUBLICATIONS = ["Problemi", "Tribuna", "Problemi. Literatura"]
+TEXT_TYPES = ["proza", "drama", "poezija", "hibrid"]
+YEARS = [1964, 1968, 1970, 1971, 1972]
+
+# Končnice za sklonjene oblike (rodilnik, dajalnik, orodnik)
+MALE_ENDINGS = ["a", "u", "om"]
+FEMALE_ENDINGS = ["e", "i", "o"]
+
+
+def _inflect(word, feminine):
+    """Vrne preproste sklonjene oblike imena (imenovalnik + trije skloni)."""
+    if feminine and word.endswith("a"):
+        return [word] + [word[:-1] + ending for ending in FEMALE_ENDINGS]
+    return [word] + [word + ending for ending in MALE_ENDINGS]
+
+
+def _wiki_link(name):
+    return "https://sl.wikipedia.org/wiki/" + name.replace(" ", "_")
+
+
+def character_pool(rng, size):
+    """Nabor likov: (character, lemma, oblike, podtip, povezava, ženskega spola)."""
+    pool = []
+    for _ in range(size):
+        kind = rng.random()
+        if kind < 0.15:
+            role = str(rng.choice(ROLES))
+            feminine = role.endswith("a")
+            pool.append((role, role, _inflect(role, feminine), "descriptive", None, feminine))
+            continue
+        feminine = bool(rng.random() < 0.35)
+        first = str(rng.choice(FEMALE_NAMES if feminine else MALE_NAMES))
+        surname = str(rng.choice(SURNAMES))
+        if kind < 0.35:
+            # Resnična oseba s polnim imenom in povezavo
+            name = f"{first} {surname}"
+            link = _wiki_link(name) if rng.random() < 0.9 else "X"
+            forms = [f"{first} {form}" for form in _inflect(surname, False)] + [surname]
+            pool.append((name, name, forms, "real", link, feminine))
+        elif kind < 0.7:
+            pool.append((first, first, _inflect(first, feminine), "literary", None, feminine))
+        else:
+            pool.append((surname, surname, _inflect(surname, False), "literary", None, False))
+    return pool
+
+
+def generate(n_rows, seed=68):
+    """Ustvari DataFrame z `n_rows` vrsticami v shemi seznama oseb (pred predobdelavo)."""
+    rng = np.random.default_rng(seed)
+    n_texts = max(1, n_rows // 30)
+    n_authors = max(20, n_texts // 5)
+    pool = character_pool(rng, max(100, n_rows // 8))
+
+    authors = []
+    for _ in range(n_authors):
+        feminine = bool(rng.random() < 0.1)
+        first = str(rng.choice(FEMALE_NAMES if feminine else MALE_NAMES))
+        authors.append((f"{first} {rng.choice(SURNAMES)}", "ženski" if feminine else "moški", int(rng.integers(1900, 1952))))
+
+    # Nekaj zelo dolgih besedil in veliko kratkih, kot v korpusu
+    weights = rng.lognormal(0.0, 1.2, n_texts)
+    rows_per_text = rng.multinomial(n_rows - n_texts, weights / weights.sum()) + 1
+    id_width = max(4, len(str(n_texts)))
+
+    columns = {name: [] for name in [
+        "title_(year)", "text_id", "author", "publication", "gender", "subtype", "type", "birth",
+        "text_type", "year", "surface", "lemma", "character", "comment", "real_char", "real_link",
+    ]}
+    for t, count in enumerate(rows_per_text):
+        words = rng.choice(TITLE_WORDS, int(rng.integers(1, 5)))
+        title = " ".join(words).capitalize()
+        if rng.random() < 0.2:
+            title += " / " + str(rng.choice(SUBTITLES))
+        author, gender, birth = authors[int(rng.integers(n_authors))]
+        if rng.random() < 0.15:
+            # Besedilo dveh avtorjev
+            second = authors[int(rng.integers(n_authors))]
+            author, gender, birth = f"{author};{second[0]}", f"{gender};{second[1]}", f"{birth};{second[2]}"
+        cast = rng.choice(len(pool), min(len(pool), 1 + count // 6), replace=False)
+        # Glavni liki se pojavijo večkrat kot stranski
+        members = cast[np.minimum(rng.geometric(0.3, count) - 1, len(cast) - 1)]
+        text = {
+            "title_(year)": title,
+            "text_id": f"maj68-{t + 1:0{id_width}d}",
+            "author": author,
+            "publication": str(rng.choice(PUBLICATIONS, p=[0.67, 0.2, 0.13])),
+            "gender": gender,
+            "type": "person",
+            "birth": birth,
+            "text_type": str(rng.choice(TEXT_TYPES, p=[0.72, 0.19, 0.075, 0.015])),
+            "year": int(rng.choice(YEARS)),
+        }
+        for key, value in text.items():
+            columns[key].extend([value] * count)
+        for member in members:
+            character, lemma, forms, subtype, link, feminine = pool[member]
+            columns["subtype"].append(subtype)
+            columns["lemma"].append(lemma)
+            columns["surface"].append(forms[int(rng.integers(len(forms)))])
+            columns["real_link"].append(link)
+            if subtype == "literary" and rng.random() < 0.015:
+                # Ženska, imenovana po možu: v izvorni tabeli je 'character' izpeljana oblika
+                columns["character"].append(character + ("eva" if character[-1] in "cčšžj" else "ova"))
+                columns["real_char"].append(character if rng.random() < 0.8 else None)
+                columns["comment"].append(" po priimku moža")
+            else:
+                columns["character"].append(character)
+                columns["real_char"].append(None)
+                columns["comment"].append(None)
+
+    df = pd.DataFrame(columns)
+    df.insert(0, "#", np.arange(1, n_rows + 1))
+    df.insert(8, "id", ["#" + str(value) for value in np.cumsum(rng.integers(1, 120, n_rows))])
+    return df
+
+
+def workbook_path(n_rows, seed=68):
+    return os.path.join(DATA_DIR, f"synthetic-{n_rows}-seed{seed}.xlsx")
+
+
+def ensure_workbook(n_rows, seed=68, path=None):
+    """Vrne pot do sintetičnega delovnega zvezka in ga po potrebi ustvari."""
+    path = path or workbook_path(n_rows, seed)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.xlsx"
+        generate(n_rows, seed).to_excel(tmp, sheet_name="Sheet1", index=False)
+        os.replace(tmp, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--seed", type=int, default=68)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    print(ensure_workbook(args.rows, args.seed, args.output))
+
+
+if __name__ == "__main__":
+    main()
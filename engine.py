@@ -0,0 +1,418 @@
+"""
+Iskalno jedro iskalnika po bazi lastnih imen korpusa Maj68 (brez Streamlita).
+
+Modul združuje nalaganje podatkov (prek posnetka iz snapshot.py), izgradnjo
+indeksov in iskanje, da ga lahko uporabljajo Streamlit aplikacija, paketno
+iskanje iz ukazne vrstice (batch_search.py) in meritve.
+
+    from engine import load_dataset, search_data
+    dataset = load_dataset()
+    results = search_data(dataset, "Zobec", column="character", exact=True)
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from autocomplete import Autocomplete
+from entities import EntityTable
+from facets import Facets
+from fuzzy import FuzzyIndex
+from normalization import normalize_string
+from ranges import build_range_indexes
+from snapshot import SHEET, SOURCE, format_for_display, load_snapshot
+from timing import NULL_TIMER
+
+# Definiraj seznam stolpcev, ki jih NE želimo prikazovati in ki ne smejo biti na voljo kot možnosti iskanja
+EXCLUDED_COLUMNS = ['id', 'lemma', 'surface', 'comment', 'real_char', 'real_link']
+
+# Slovenski prevodi stolpcev za prikaz:
+RENAME_DICT = {
+    "title_(year)": "naslov",
+    "text_id": "id teksta",
+    "author": "avtor",
+    "publication": "publikacija",
+    "gender": "spol",
+    "subtype": "podtip",
+    "type": "tip",
+    "birth": "leto rojstva",
+    "text_type": "zvrst",
+    "year": "leto izdaje",
+    "character": "kanonična oblika"  # spremenjeno iz "protagonist"
+}
+
+# Dolžina n-gramov v indeksu za delno ujemanje
+NGRAM_SIZE = 3
+
+# Največ toliko vrednosti prejšnje poizvedbe pri dopolnjevanju preverimo neposredno (glej refine_search)
+REFINE_MAX_VALUES = 2000
+
+
+def valid_columns(dataframe):
+    # Očisti imena stolpcev, da odstraniš neveljavne možnosti (tudi tiste, ki so samo "#")
+    return [col for col in dataframe.columns if col not in EXCLUDED_COLUMNS and col.strip() != "#"]
+
+
+# Zgradi indeks n-gramov (posting liste) nad unikatnimi normaliziranimi vrednostmi.
+# Vsaka celica tabele je predstavljena s kodo vrednosti v skupnem slovarju, zato
+# isti indeks služi globalnemu iskanju in iskanju v posameznem stolpcu.
+def build_ngram_index(dataframe, normalized):
+    columns = list(normalized.columns)
+    codes, vocabulary = pd.factorize(normalized.to_numpy().ravel(order="F"))
+    codes = codes.reshape(len(columns), len(normalized))
+    postings = {}
+    for value_id, value in enumerate(vocabulary):
+        for gram in {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}:
+            postings.setdefault(gram, []).append(value_id)
+    postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+    return {
+        "columns": {col: i for i, col in enumerate(columns)},
+        "vocabulary": list(vocabulary),
+        "codes": codes,
+        "postings": postings,
+        # Katere celice niso prazne (iskanje v stolpcu jih upošteva le take)
+        "present": {col: dataframe[col].notna().to_numpy() for col in columns},
+    }
+
+
+def group_rows(codes, rows, vocabulary):
+    """Združi številke vrstic po kodah vrednosti v slovar vrednost -> urejene vrstice."""
+    if len(rows) == 0:
+        return {}
+    stride = int(rows.max()) + 1
+    keys = np.sort(codes.astype(np.int64) * stride + rows)
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+    codes, rows = np.divmod(keys, stride)
+    rows = rows.astype(np.int32)
+    bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True]).tolist()
+    codes = codes.tolist()
+    return {vocabulary[codes[a]]: rows[a:b] for a, b in zip(bounds[:-1], bounds[1:])}
+
+
+# Zgradi slovarje normalizirana vrednost -> številke vrstic za natančno ujemanje:
+# enega za vsak stolpec (brez praznih vrednosti) in enega globalnega čez vse celice.
+# Kode vrednosti si deli z indeksom n-gramov.
+def build_exact_index(ngram_index):
+    vocabulary = ngram_index["vocabulary"]
+    codes = ngram_index["codes"]
+    all_rows = np.arange(codes.shape[1])
+    columns = {}
+    for col, i in ngram_index["columns"].items():
+        present = ngram_index["present"][col]
+        columns[col] = group_rows(codes[i][present], all_rows[present], vocabulary)
+    everywhere = group_rows(codes.ravel(), np.tile(all_rows, codes.shape[0]), vocabulary)
+    return {"columns": columns, "global": everywhere}
+
+
+def variation_key(label, title, canonical, normalized_canonical):
+    """Ključ skupine variacij: naslov dela in normalizirana kanonična oblika.
+
+    Vrstice brez kanonične oblike ne združujemo z drugimi, zato je njihov ključ vrstica sama.
+    """
+    if pd.isna(canonical):
+        return (title, None, label)
+    return (title, normalized_canonical)
+
+
+# Za vsak par (naslov dela, normalizirana kanonična oblika) vnaprej zberi variacije
+# imen iz 'lemma' in 'surface', komentarje in povezavo, da je expander en sam vpogled.
+def build_variation_groups(dataframe, normalized):
+    # Manjkajoč naslov kot None (NaN ni enak samemu sebi in ne more biti del ključa)
+    titles = dataframe["title_(year)"].astype(object)
+    keys = map(
+        variation_key, dataframe.index, titles.where(titles.notna(), None), dataframe["character"],
+        normalized["character"],
+    )
+    rows_by_key = {}
+    for row, key in enumerate(keys):
+        rows_by_key.setdefault(key, []).append(row)
+
+    lemmas = dataframe["lemma"].to_numpy(dtype=object)
+    surfaces = dataframe["surface"].to_numpy(dtype=object)
+    comments = dataframe["comment"].to_numpy(dtype=object)
+    links = dataframe["real_link"].to_numpy(dtype=object)
+    groups = {}
+    for key, rows in rows_by_key.items():
+        variations = [str(v) for v in lemmas[rows] if pd.notna(v)] + [str(v) for v in surfaces[rows] if pd.notna(v)]
+        # Povezavo upoštevamo le, če je URL veljaven (npr. se začne z "http")
+        valid_links = [v.strip() for v in links[rows] if isinstance(v, str) and v.strip().startswith("http")]
+        groups[key] = {
+            "variations": tuple(dict.fromkeys(variations)),
+            "comments": tuple(dict.fromkeys(str(v) for v in comments[rows] if pd.notna(v))),
+            "real_link": valid_links[0] if valid_links else None,
+        }
+    return groups
+
+
+class Dataset:
+    """Naložen seznam oseb skupaj z indeksi. Po izgradnji se ne spreminja.
+
+    Atributi:
+        data (pd.DataFrame): preobdelani podatki.
+        normalized (pd.DataFrame): normalizirani stolpci z istim indeksom.
+        version (str): različica podatkov (SHA-256 izvorne datoteke).
+        source (str): izvorna datoteka .xlsx.
+        columns (list): vsi stolpci.
+        valid_columns (list): stolpci, ki jih prikazujemo in po katerih lahko iščemo.
+    """
+
+    def __init__(self, data, normalized):
+        self.data = data
+        self.normalized = normalized
+        self.version = data.attrs.get("version")
+        self.source = data.attrs.get("source")
+        self.columns = list(data.columns)
+        self.valid_columns = valid_columns(data)
+        # Polja stolpcev (sklici na podatke, ne kopije) za display_column
+        self._arrays = {col: data[col].array for col in self.columns}
+        self.ngram_index = build_ngram_index(data, normalized)
+        self.exact_index = build_exact_index(self.ngram_index)
+        self.variation_groups = build_variation_groups(data, normalized)
+        self._fuzzy_index = None
+        self._autocomplete = None
+        self._entities = None
+        # Eno zaklepanje na leno strukturo: seja in nit, ki jih gradi v ozadju (watcher), je ne gradita dvakrat
+        self._lazy_locks = {name: threading.Lock() for name in ("_fuzzy_index", "_autocomplete", "_entities")}
+        self.facets = Facets(self)
+        self.ranges = build_range_indexes(self)
+
+    def _lazy(self, name, build):
+        """Lena struktura v atributu `name`; če jo že gradi druga nit, počakamo nanjo."""
+        value = getattr(self, name)
+        if value is None:
+            with self._lazy_locks[name]:
+                value = getattr(self, name)
+                if value is None:
+                    value = build()
+                    setattr(self, name, value)
+        return value
+
+    @property
+    def fuzzy_index(self):
+        """Indeks za približno ujemanje (glej fuzzy.py); zgradi se ob prvi uporabi."""
+        return self._lazy("_fuzzy_index", lambda: FuzzyIndex(self.exact_index))
+
+    @property
+    def autocomplete(self):
+        """Predlogi za samodejno dopolnjevanje; zgradijo se ob prvi uporabi."""
+        return self._lazy("_autocomplete", lambda: Autocomplete(self.data, self.normalized, self.valid_columns))
+
+    @property
+    def entities(self):
+        """Tabela entitet (glej entities.py); zgradi se ob prvi uporabi."""
+        return self._lazy("_entities", lambda: EntityTable(self))
+
+    def match_rows(self, normalized_query, column=None, exact=False, distance=None):
+        """Številke ujemajočih se vrstic (glej match_rows); enak vmesnik ima sqlite_backend.SqliteDataset."""
+        return match_rows(self, normalized_query, column, exact, distance)
+
+    def frame(self, rows):
+        """Vrstice `rows` (v tem vrstnem redu) kot DataFrame."""
+        return self.data.iloc[rows]
+
+    def normalized_at(self, column, position):
+        """Normalizirana vrednost celice (brez izbire iz DataFrame-a)."""
+        index = self.ngram_index
+        return index["vocabulary"][index["codes"][index["columns"][column], position]]
+
+    def display_column(self, column, rows=None):
+        """Vrednosti stolpca v obliki za prikaz (kot format_for_display), prazne kot None.
+
+        Z `rows` le vrednosti teh vrstic (v tem vrstnem redu). Vrednosti se ne
+        shranijo, zato stolpec za prikaz ne ostane v pomnilniku poleg podatkov.
+        """
+        # Neposredno nad poljem stolpca: izbira iz DataFrame-a je za nekaj vrstic počasna
+        array = self._arrays[column]
+        if rows is not None:
+            array = array[np.asarray(rows, dtype=np.intp)]
+        values = np.asarray(array, dtype=object)
+        missing = pd.isna(values)
+        if column == "year" and pd.api.types.is_integer_dtype(array.dtype):
+            # Kot format_for_display: leto kot niz, prazno, če manjka
+            return np.array(["" if empty else str(value) for value, empty in zip(values, missing)], dtype=object)
+        values[missing] = None
+        return values
+
+
+def load_dataset(source=SOURCE, sheet=SHEET, compact=False, timer=NULL_TIMER, prepare=None):
+    """Naloži podatke iz posnetka (glej snapshot.py) in zgradi indekse; faze meri `timer`."""
+    with timer.span("load.snapshot"):
+        data, normalized = load_snapshot(source, sheet, compact=compact, prepare=prepare)
+    with timer.span("load.indexes"):
+        return Dataset(data, normalized)
+
+
+def substring_matches(index, normalized_query):
+    """Vrne bool masko nad slovarjem vrednosti, ki vsebujejo normalized_query."""
+    vocabulary = index["vocabulary"]
+    grams = {normalized_query[i:i + NGRAM_SIZE] for i in range(len(normalized_query) - NGRAM_SIZE + 1)}
+    if grams:
+        # Presek posting list, začenši z najkrajšo
+        lists = [index["postings"].get(gram) for gram in grams]
+        if any(ids is None for ids in lists):
+            return np.zeros(len(vocabulary), dtype=bool)
+        lists.sort(key=len)
+        candidates = lists[0]
+        for ids in lists[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+    else:
+        # Prekratka poizvedba za indeks: preverimo vse vrednosti v slovarju
+        candidates = range(len(vocabulary))
+    hits = np.zeros(len(vocabulary), dtype=bool)
+    hits[[i for i in candidates if normalized_query in vocabulary[i]]] = True
+    return hits
+
+
+def match_rows(dataset, normalized_query, column=None, exact=False, distance=None):
+    """Vrne številke ujemajočih se vrstic za normalizirano poizvedbo.
+
+    Vrstice so v izvornem vrstnem redu, pri približnem iskanju (distance ni None)
+    pa urejene po razdalji do poizvedbe.
+    """
+    if distance is not None:
+        return dataset.fuzzy_index.search(normalized_query, column, distance)
+    if exact:
+        # Slovar za 'character' vsebuje le vrednosti iz 'character' (ignoriramo 'real_char')
+        exact_index = dataset.exact_index
+        lookup = exact_index["columns"][column] if column else exact_index["global"]
+        return lookup.get(normalized_query, np.empty(0, dtype=np.int32))
+    return rows_with_values(dataset.ngram_index, substring_matches(dataset.ngram_index, normalized_query), column)
+
+
+def rows_with_values(index, hits, column=None, candidates=None):
+    """Vrstice (urejene), ki imajo v stolpcu (ali v katerem koli stolpcu) vrednost iz maske `hits`.
+
+    Z `candidates` (urejene vrstice) pregledamo le te vrstice namesto vseh.
+    """
+    codes = index["codes"]
+    if column:
+        codes = codes[index["columns"][column]]
+        present = index["present"][column]
+        if candidates is not None:
+            codes, present = codes[candidates], present[candidates]
+        # Prazne vrednosti v iskanem stolpcu se nikoli ne ujemajo.
+        mask = hits[codes] & present
+    else:
+        if candidates is not None:
+            codes = codes[:, candidates]
+        mask = hits[codes].any(axis=0)
+    if candidates is not None:
+        return np.asarray(candidates, dtype=np.int32)[mask]
+    return np.flatnonzero(mask).astype(np.int32)
+
+
+def refine_search(dataset, query, column=None, previous=None, cache=None):
+    """Delno ujemanje, ki ob dopolnjevanju poizvedbe nadaljuje s prejšnjim rezultatom.
+
+    Vrne stanje {"version", "query", "column", "values", "rows"}; "rows" so enake
+    kot pri search_rows(dataset, query, column). Če je `previous` stanje prejšnje
+    poizvedbe nad istimi podatki in v istem stolpcu in je prejšnja normalizirana
+    poizvedba podniz nove, ustrezajo novi poizvedbi le vrednosti in vrstice, ki so
+    ustrezale prejšnji, zato preverimo le te. Sicer iščemo po vseh podatkih.
+    """
+    normalized_query = normalize_string(query)
+    index = dataset.ngram_index
+    vocabulary = index["vocabulary"]
+    if (
+        previous is not None and previous["version"] == dataset.version and previous["column"] == column
+        and previous["query"] in normalized_query
+    ):
+        values = previous["values"]
+        if len(values) > REFINE_MAX_VALUES and len(normalized_query) >= NGRAM_SIZE:
+            # Veliko kandidatnih vrednosti: presek posting list je hitrejši od pregleda
+            hits = substring_matches(index, normalized_query)
+            values = np.flatnonzero(hits)
+        else:
+            values = values[[normalized_query in vocabulary[i] for i in values.tolist()]]
+            hits = np.zeros(len(vocabulary), dtype=bool)
+            hits[values] = True
+        rows = rows_with_values(index, hits, column, candidates=previous["rows"])
+    else:
+        hits = substring_matches(index, normalized_query)
+        values = np.flatnonzero(hits)
+        key = (normalized_query, column, False, None)
+        rows = cache.get(dataset.version, key) if cache is not None else None
+        if rows is None:
+            rows = rows_with_values(index, hits, column)
+            if cache is not None:
+                cache.put(dataset.version, key, rows)
+    return {"version": dataset.version, "query": normalized_query, "column": column, "values": values, "rows": rows}
+
+
+def search_rows(dataset, query, column=None, exact=False, cache=None, distance=None):
+    """Številke vrstic, ki ustrezajo poizvedbi; z `cache` (QueryCache) se rezultat shrani."""
+    normalized_query = normalize_string(query)
+    key = (normalized_query, column, exact, distance)
+    rows = cache.get(dataset.version, key) if cache is not None else None
+    if rows is None:
+        rows = dataset.match_rows(normalized_query, column, exact, distance)
+        if cache is not None:
+            cache.put(dataset.version, key, rows)
+    return rows
+
+
+def search_data(dataset, query, column=None, exact=False, cache=None, distance=None):
+    """
+    Išče po podatkih za vrstice, ki ustrezajo 'query'.
+
+    Parameters:
+        dataset (Dataset ali sqlite_backend.SqliteDataset): Naloženi podatki z indeksi.
+        query (str): Iskalna poizvedba (normalizira se z normalize_string).
+        column (str, optional): Stolpec za iskanje; None pomeni globalno iskanje po vseh stolpcih.
+        exact (bool): Natančno ujemanje namesto delnega.
+        cache (QueryCache, optional): Predpomnilnik rezultatov.
+        distance (int, optional): Približno ujemanje z največ toliko napakami (glej fuzzy.py).
+
+    Returns:
+        pd.DataFrame: Ujemajoče se vrstice v izvornem vrstnem redu (pri približnem
+        ujemanju urejene po razdalji).
+    """
+    return dataset.frame(search_rows(dataset, query, column, exact, cache, distance))
+
+
+def has_details(dataset, label, normalized_query, column=None, fuzzy=False):
+    """Ali za zadetek prikažemo podrobnosti (variacije imen, komentar, povezavo)?
+
+    Pri globalnem iskanju le, če se iskani niz nahaja v 'character' (pri približnem
+    iskanju, če ima vrstica kanonično obliko), pri iskanju v določenem polju pa le,
+    če je to polje 'character'.
+    """
+    if column is None:
+        position = dataset.data.index.get_loc(label)
+        if fuzzy:
+            return dataset.display_column("character", [position])[0] is not None
+        return normalized_query in dataset.normalized_at("character", position)
+    return column == "character"
+
+
+def details(dataset, label):
+    """Podrobnosti zadetka z oznako vrstice `label` (en vpogled v vnaprej zgrajene skupine)."""
+    # Vrednosti beremo iz stolpcev za prikaz (izbira iz DataFrame-a z .loc/.at je počasna)
+    position = dataset.data.index.get_loc(label)
+    row = {col: dataset.display_column(col, [position])[0] for col in ("character", "author", "title_(year)", "real_char")}
+    group = dataset.variation_groups[
+        variation_key(label, row["title_(year)"], row["character"], dataset.normalized_at("character", position))
+    ]
+    return {
+        "character": row["character"],
+        "author": row["author"],
+        "title": row["title_(year)"],
+        "real_char": row["real_char"],
+        "variations": list(group["variations"]),
+        "comments": list(group["comments"]),
+        "real_link": group["real_link"],
+    }
+
+
+def to_records(dataset, rows, columns=None):
+    """Pretvori vrstice (številke vrstic) v seznam slovarjev za JSON (prazne vrednosti kot None)."""
+    columns = columns or dataset.valid_columns
+    if isinstance(dataset, Dataset):
+        values = [dataset.display_column(col, rows).tolist() for col in columns]
+    else:
+        # Drugi viri (npr. sqlite_backend.SqliteDataset) vrnejo vrstice kot DataFrame
+        frame = dataset.frame(rows)[columns].astype(object)
+        values = [frame[col].where(frame[col].notna(), None).tolist() for col in columns]
+    return [dict(zip(columns, record)) for record in zip(*values)]
@@ -0,0 +1,88 @@
+"""
+Tabela entitet: en zapis za vsako normalizirano kanonično obliko ('character').
+
+Zapis vsebuje vsa besedila (id, naslov), avtorje, leta izdaje, število omemb,
+različice imena (lemma, surface), komentarje, povezavo in številke vrstic
+omemb. Tabela je precej manjša od seznama omemb, zato iskanje oseb pregleda le
+njo (po imenu in različicah), omembe pa prikažemo šele na zahtevo.
+"""
+import numpy as np
+
+from normalization import normalize_string, normalize_value
+
+
+def _unique(values):
+    """Unikatne neprazne vrednosti v vrstnem redu prvega pojavljanja."""
+    return list(dict.fromkeys(value for value in values if value is not None))
+
+
+def _by_frequency(values):
+    """Unikatne neprazne vrednosti, urejene po pogostosti (ob enakosti po prvem pojavljanju)."""
+    counts = {}
+    for value in values:
+        if value is not None:
+            counts[value] = counts.get(value, 0) + 1
+    return sorted(counts, key=lambda value: -counts[value])
+
+
+class EntityTable:
+    """Entitete, urejene po številu omemb (padajoče)."""
+
+    def __init__(self, dataset):
+        column = dataset.display_column
+        characters = column("character")
+        real_chars = column("real_char")
+        text_ids = column("text_id")
+        titles = column("title_(year)")
+        authors = column("author")
+        years = column("year")
+        lemmas = column("lemma")
+        surfaces = column("surface")
+        comments = column("comment")
+        links = column("real_link")
+
+        entities = []
+        for key, rows in dataset.exact_index["columns"]["character"].items():
+            if not key:
+                continue
+            rows_list = rows.tolist()
+            variants = _by_frequency(list(lemmas[rows]) + list(surfaces[rows]))
+            valid_links = [v.strip() for v in links[rows] if isinstance(v, str) and v.strip().startswith("http")]
+            entities.append({
+                "key": key,
+                "name": _by_frequency(characters[rows])[0],
+                "real_chars": _unique(real_chars[rows]),
+                "rows": rows,
+                "mentions": len(rows_list),
+                "texts": _unique(zip(text_ids[rows], titles[rows])),
+                "authors": _unique(authors[rows]),
+                # Prazno leto (manjkajoča vrednost) ni leto izdaje
+                "years": sorted(year for year in _unique(years[rows]) if year),
+                "variants": variants,
+                "comments": _unique(comments[rows]),
+                "real_link": valid_links[0] if valid_links else None,
+            })
+        entities.sort(key=lambda entity: (-entity["mentions"], entity["key"]))
+        self.entities = entities
+        # Normalizirano ime in različice vsake entitete (za iskanje)
+        self._names = [
+            [entity["key"]] + [normalize_value(form) for form in entity["variants"] + entity["real_chars"]]
+            for entity in entities
+        ]
+        self._haystacks = ["\n".join(names) for names in self._names]
+
+    def __len__(self):
+        return len(self.entities)
+
+    def search(self, query, exact=False):
+        """Indeksi entitet (po številu omemb), katerih ime ali različica ustreza poizvedbi."""
+        normalized_query = normalize_string(query)
+        if exact:
+            return [i for i, names in enumerate(self._names) if normalized_query in names]
+        if "\n" in normalized_query:
+            return []
+        return [i for i, haystack in enumerate(self._haystacks) if normalized_query in haystack]
+
+    def mentions(self, index):
+        """Številke vrstic omemb entitete (urejene)."""
+        return np.asarray(self.entities[index]["rows"])
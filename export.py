@@ -0,0 +1,112 @@
+"""
+Izvoz zadetkov iskanja v CSV, XLSX ali JSON Lines.
+
+Vrstice se iz številk vrstic zadetkov po kosih (CHUNK_ROWS) pretvorijo v obliko
+za prikaz (Dataset.display_column) in se takoj zapišejo v izhodni tok, zato
+poraba pomnilnika ni odvisna od števila zadetkov (razen samega izhoda, če je
+ta v pomnilniku).
+Glave stolpcev so slovenske (RENAME_DICT).
+
+    python export.py "Zobec" --column character --exact --format xlsx -o zobec.xlsx
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+
+from openpyxl import Workbook
+
+from engine import RENAME_DICT, load_dataset, search_rows
+from snapshot import SHEET, SOURCE
+
+# Število vrstic, ki jih naenkrat preberemo iz stolpcev
+CHUNK_ROWS = 5000
+
+# Format -> (MIME tip, končnica datoteke)
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+    "jsonl": ("application/x-ndjson", ".jsonl"),
+}
+
+
+def iter_rows(dataset, rows, columns, chunk_rows=CHUNK_ROWS):
+    """Vrstice zadetkov kot n-terice vrednosti za prikaz (prazne kot None), po kosih."""
+    for start in range(0, len(rows), chunk_rows):
+        chunk = rows[start:start + chunk_rows]
+        yield from zip(*(dataset.display_column(col, chunk) for col in columns))
+
+
+def write_csv(out, headers, records):
+    # BOM, da Excel prepozna UTF-8 (č, š, ž)
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(records)
+    text.flush()
+    text.detach()
+
+
+def write_jsonl(out, headers, records):
+    for record in records:
+        out.write(json.dumps(dict(zip(headers, record)), ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def write_xlsx(out, headers, records):
+    # Način write_only vrstice sproti zapisuje v začasno datoteko
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Zadetki")
+    sheet.append(headers)
+    for record in records:
+        sheet.append(record)
+    workbook.save(out)
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "jsonl": write_jsonl}
+
+
+def export_rows(dataset, rows, fmt, out, columns=None):
+    """Zapiše zadetke (številke vrstic) v binarni tok `out` v formatu `fmt` (csv, xlsx, jsonl)."""
+    columns = columns or dataset.valid_columns
+    headers = [RENAME_DICT.get(col, col) for col in columns]
+    WRITERS[fmt](out, headers, iter_rows(dataset, rows, columns))
+
+
+def export_buffer(dataset, rows, fmt, columns=None):
+    """Zadetki v izbranem formatu kot io.BytesIO (za st.download_button)."""
+    buffer = io.BytesIO()
+    export_rows(dataset, rows, fmt, buffer, columns)
+    buffer.seek(0)
+    return buffer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", help="iskalna poizvedba")
+    parser.add_argument("-o", "--output", help="izhodna datoteka (privzeto standardni izhod)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--column", help="stolpec za iskanje (privzeto globalno iskanje)")
+    parser.add_argument("--exact", action="store_true", help="natančno ujemanje namesto delnega")
+    parser.add_argument("--distance", type=int, help="približno ujemanje z največ toliko napakami (1 ali 2)")
+    parser.add_argument("--fields", help="izvoženi stolpci, ločeni z vejico (privzeto prikazani stolpci)")
+    parser.add_argument("--source", default=SOURCE, help="izvorna datoteka .xlsx")
+    parser.add_argument("--sheet", default=SHEET, help="delovni list")
+    args = parser.parse_args(argv)
+
+    dataset = load_dataset(args.source, args.sheet)
+    fields = args.fields.split(",") if args.fields else None
+    unknown = [col for col in [args.column] + (fields or []) if col and col not in dataset.data.columns]
+    if unknown:
+        parser.error(f"neznani stolpci: {', '.join(unknown)}")
+    rows = search_rows(dataset, args.query, args.column, args.exact, distance=args.distance)
+    if args.output:
+        with open(args.output, "wb") as out:
+            export_rows(dataset, rows, args.format, out, fields)
+    else:
+        export_rows(dataset, rows, args.format, sys.stdout.buffer, fields)
+        sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Fasete (avtor, spol, zvrst, publikacija, tip, podtip, leto izdaje) s števci.
+
+Ob nalaganju za vsako vrednost fasete zgradimo zapakirano bitno množico vrstic
+(np.packbits, 64-bitne besede). Filtriranje zadetkov je potem le bitni AND z
+bitno množico zadetkov, števci pa popcount (np.bitwise_count v NumPy 2, sicer
+np.unpackbits). Vrstice razdelimo po kodah stolpca (pd.factorize, pri
+kategorijah kar njihove kode), v obliko za prikaz pa pretvorimo le različne
+vrednosti. Vrednosti v stolpcih z več vrednostmi (npr.
+'Dimitrij Rupel;Mate Dolenc') razdelimo, tako da vrstica pripada vsakemu od
+avtorjev. Manjkajoča ali prazna vrednost je MISSING.
+
+Znotraj fasete se izbrane vrednosti združijo z ALI, med fasetami pa z IN.
+Števci fasete upoštevajo izbire v vseh drugih fasetah, ne pa v njej sami, zato
+kažejo, koliko zadetkov bi dobili, če bi dodali še to vrednost.
+"""
+import numpy as np
+import pandas as pd
+
+from snapshot import format_for_display
+
+FACET_COLUMNS = ["author", "gender", "text_type", "publication", "type", "subtype", "year"]
+
+# Stolpci, v katerih je lahko več vrednosti, ločenih s podpičjem
+MULTI_VALUED = {"author", "gender"}
+
+# Oznaka za manjkajočo vrednost
+MISSING = "(ni podatka)"
+
+
+def empty_bitset(n_rows):
+    return np.zeros(-(-n_rows // 64), dtype=np.uint64)
+
+
+def mask_to_bitset(mask):
+    """Bool polje -> bitna množica (64-bitne besede, bit i = vrstica i)."""
+    words = empty_bitset(len(mask))
+    words.view(np.uint8)[:-(-len(mask) // 8)] = np.packbits(mask, bitorder="little")
+    return words
+
+
+def rows_to_bitset(rows, n_rows):
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[rows] = True
+    return mask_to_bitset(mask)
+
+
+def popcount(bitset):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bitset).sum())
+    # NumPy < 2.0 nima np.bitwise_count
+    return int(np.unpackbits(bitset.view(np.uint8)).sum())
+
+
+def contains(bitset, rows):
+    """Bool polje: ali je posamezna vrstica iz `rows` v bitni množici (vrstni red ostane)."""
+    bytes_ = bitset.view(np.uint8)
+    return ((bytes_[rows >> 3] >> (rows & 7).astype(np.uint8)) & 1).astype(bool)
+
+
+class Facets:
+    """Bitne množice vrstic za vsako vrednost vsake fasete."""
+
+    def __init__(self, dataset, columns=FACET_COLUMNS):
+        self.n_rows = len(dataset.data)
+        self.bitsets = {}
+        self.totals = {}
+        for col in columns:
+            codes, uniques = pd.factorize(dataset.data[col])
+            # Koda 0 so manjkajoče vrednosti (pd.factorize jim da -1)
+            codes = codes + 1
+            labels = [MISSING] + [
+                str(label) for label in format_for_display(pd.DataFrame({col: uniques}))[col].tolist()
+            ]
+            # Oznaka -> kode, ki jo vsebujejo; vsaka vrstica pripada vsaki od vrednosti, ločenih s podpičjem
+            label_codes = {}
+            for code, label in enumerate(labels):
+                for value in label.split(";") if col in MULTI_VALUED else [label]:
+                    label_codes.setdefault(value.strip() or MISSING, []).append(code)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            bitsets = {}
+            for value, value_codes in label_codes.items():
+                rows = np.concatenate([order[bounds[code]:bounds[code + 1]] for code in value_codes])
+                if len(rows):
+                    bitsets[value] = rows_to_bitset(rows, self.n_rows)
+            # Vrednosti po pogostosti padajoče (leta kronološko)
+            totals = {value: popcount(bits) for value, bits in bitsets.items()}
+            key = (lambda value: (value == MISSING, value)) if col == "year" else (lambda value: -totals[value])
+            self.bitsets[col] = {value: bitsets[value] for value in sorted(bitsets, key=key)}
+            self.totals[col] = {value: totals[value] for value in self.bitsets[col]}
+
+    def values(self, column):
+        """Vrednosti fasete v vrstnem redu za prikaz."""
+        return list(self.bitsets[column])
+
+    def selection_bitset(self, column, selected):
+        """ALI bitnih množic izbranih vrednosti fasete (None, če ni izbire)."""
+        if not selected:
+            return None
+        bits = empty_bitset(self.n_rows)
+        for value in selected:
+            bits |= self.bitsets[column][value]
+        return bits
+
+    def apply(self, rows, selections):
+        """Filtrira zadetke (številke vrstic) z izbirami {faseta: [vrednosti]}.
+
+        Vrne (filtrirane vrstice v izvornem vrstnem redu, {faseta: {vrednost: število}}).
+        """
+        result = rows_to_bitset(rows, self.n_rows)
+        filters = {
+            col: bits for col, bits in
+            ((col, self.selection_bitset(col, selected)) for col, selected in selections.items()) if bits is not None
+        }
+        combined = result.copy()
+        for bits in filters.values():
+            combined &= bits
+        counts = {}
+        for col, bitsets in self.bitsets.items():
+            # Števci fasete upoštevajo le izbire v drugih fasetah
+            base = result.copy()
+            for other, bits in filters.items():
+                if other != col:
+                    base &= bits
+            counts[col] = {value: popcount(bits & base) for value, bits in bitsets.items()}
+        if filters:
+            rows = rows[contains(combined, rows)]
+        return rows, counts
@@ -0,0 +1,120 @@
+"""
+Približno iskanje (do k napak) po imenih.
+
+Indeks SymSpell: za vsako unikatno normalizirano vrednost shranimo vse nize, ki
+nastanejo z izbrisom do MAX_DISTANCE znakov iz njene predpone (prvih
+PREFIX_LENGTH znakov). Poizvedba enako izbriše znake iz svoje predpone, v
+slovarju poišče kandidate in jim izračuna Levenshteinovo razdaljo. Razdalja
+med predponama ni nikoli večja od razdalje med celima nizoma, zato iskanje ne
+izpusti nobene vrednosti, računanje razdalje pa je omejeno na peščico
+kandidatov namesto na vse vrednosti.
+"""
+import numpy as np
+
+# Največje število napak (vstavljanje, brisanje ali zamenjava znaka), ki ga indeks podpira
+MAX_DISTANCE = 2
+
+# Dolžina predpone, iz katere tvorimo izbrise (omeji velikost indeksa pri dolgih imenih)
+PREFIX_LENGTH = 7
+
+# Stolpci z imeni, po katerih približno iščemo pri globalnem iskanju
+FUZZY_COLUMNS = ["character", "lemma", "surface"]
+
+
+def deletes(word, max_distance):
+    """Vsi nizi, ki nastanejo iz `word` z izbrisom največ `max_distance` znakov (vključno z word)."""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - result
+        result |= frontier
+    return result
+
+
+def levenshtein(a, b, limit):
+    """Levenshteinova razdalja med a in b ali limit + 1, če je večja od limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for j, cb in enumerate(b, 1):
+        current = [j]
+        for i, ca in enumerate(a, 1):
+            current.append(min(previous[i] + 1, current[i - 1] + 1, previous[i - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class SymSpell:
+    """Indeks izbrisov nad seznamom nizov (`words`)."""
+
+    def __init__(self, words, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.words = list(words)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletes = {}
+        for word_id, word in enumerate(self.words):
+            for key in deletes(word[:prefix_length], max_distance):
+                self._deletes.setdefault(key, []).append(word_id)
+
+    def lookup(self, query, distance):
+        """Vrne [(razdalja, niz)] za vse nize z razdaljo največ `distance`, urejene po razdalji."""
+        distance = min(distance, self.max_distance)
+        candidates = set()
+        for key in deletes(query[:self.prefix_length], distance):
+            candidates.update(self._deletes.get(key, ()))
+        matches = []
+        for word_id in candidates:
+            word = self.words[word_id]
+            d = levenshtein(query, word, distance)
+            if d <= distance:
+                matches.append((d, word))
+        matches.sort()
+        return matches
+
+
+class FuzzyIndex:
+    """Indeksi SymSpell za globalno iskanje (FUZZY_COLUMNS) in za posamezne stolpce.
+
+    Vrstice zadetkov poiščemo v indeksu za natančno ujemanje (engine.build_exact_index),
+    zato tu hranimo le unikatne vrednosti. Indeksi za stolpce se zgradijo ob prvi uporabi.
+    """
+
+    def __init__(self, exact_index):
+        self._exact_index = exact_index
+        self._columns = {}
+        self._global = SymSpell(self._values(FUZZY_COLUMNS))
+
+    def _values(self, columns):
+        values = {}
+        for col in columns:
+            values.update(dict.fromkeys(self._exact_index["columns"][col]))
+        values.pop("", None)
+        return values
+
+    def _lookup_rows(self, columns, matches):
+        best = {}
+        for d, value in matches:
+            for col in columns:
+                rows = self._exact_index["columns"][col].get(value)
+                if rows is None:
+                    continue
+                for row in rows.tolist():
+                    if row not in best:
+                        best[row] = d
+        # Po razdalji, ob enakosti v izvornem vrstnem redu
+        return np.array(sorted(best, key=lambda row: (best[row], row)), dtype=np.int32)
+
+    def search(self, normalized_query, column=None, distance=1):
+        """Številke vrstic z vrednostjo v razdalji največ `distance`, urejene po razdalji."""
+        if not normalized_query:
+            return np.empty(0, dtype=np.int32)
+        if column is None:
+            return self._lookup_rows(FUZZY_COLUMNS, self._global.lookup(normalized_query, distance))
+        index = self._columns.get(column)
+        if index is None:
+            index = self._columns[column] = SymSpell(self._values([column]))
+        return self._lookup_rows([column], index.lookup(normalized_query, distance))
@@ -0,0 +1,48 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Normaliziraj nize, da obravnava "č", "ć", "c"; "š", "s"; in "ž", "z" kot enake
+def normalize_string(s):
+    if not isinstance(s, str):
+        return s
+    s = unicodedata.normalize('NFKD', s)
+    return ''.join(c for c in s if not unicodedata.combining(c)).lower()
+
+# Razponi znakov, katerih normalizacijo izračunamo vnaprej: ASCII, latinica z
+# diakritiki (Latin-1, Latin Extended-A/B: č, š, ž, ć, đ, ...), kombinirani
+# diakritični znaki in Latin Extended Additional. Za te znake je rezultat
+# normalize_string niza enak stiku rezultatov po posameznih znakih.
+TRANSLATED_RANGES = [(0x0000, 0x0250), (0x0300, 0x0370), (0x1E00, 0x1F00)]
+
+TRANSLATION_TABLE = {
+    code: normalize_string(chr(code))
+    for start, end in TRANSLATED_RANGES
+    for code in range(start, end)
+}
+TRANSLATABLE = frozenset(map(chr, TRANSLATION_TABLE))
+
+
+def normalize_value(s):
+    """Enako kot normalize_string, a s tabelo znakov namesto NFKD, kjer je to mogoče."""
+    if not isinstance(s, str):
+        return s
+    if s.isascii():
+        return s.lower()
+    if TRANSLATABLE.issuperset(s):
+        return s.translate(TRANSLATION_TABLE)
+    # Drugi znaki (npr. grščina, kjer je lower() odvisen od konteksta): NFKD
+    return normalize_string(s)
+
+
+def normalize_series(series):
+    """Normalizira str(vrednost) za vsako celico stolpca.
+
+    Stolpec najprej razstavimo na unikatne vrednosti (pd.factorize), vsako
+    normaliziramo enkrat in rezultat prek kod razširimo nazaj na vrstice.
+    Prazne celice postanejo niz "nan", enako kot normalize_string(str(x)).
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    normalized = np.array([normalize_value(str(value)) for value in uniques], dtype=object)
+    return pd.Series(normalized[codes], index=series.index, name=series.name)
@@ -0,0 +1,89 @@
+"""
+Predpomnilnik rezultatov iskanja, skupen vsem sejam v procesu.
+
+Ključ je (normalizirana poizvedba, stolpec, natančno ujemanje), vrednost pa
+polje številk vrstic (np.int32), ne kopija DataFrame-a. Velikost je omejena s
+številom vnosov in z bajti; najdlje neuporabljeni vnosi se zavržejo (LRU).
+Vsak vnos pripada različici podatkov: ko se različica spremeni, se
+predpomnilnik izprazni.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+# Ocena režije enega vnosa (ključ, vozlišče OrderedDict, glava polja) v bajtih
+ENTRY_OVERHEAD = 200
+
+
+class QueryCache:
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(key, rows):
+        return rows.nbytes + sum(sys.getsizeof(part) for part in key) + ENTRY_OVERHEAD
+
+    def _check_version(self, version):
+        # Klicano z zaklenjenim self._lock
+        if version != self._version:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, version, key):
+        """Vrne shranjene številke vrstic ali None."""
+        with self._lock:
+            self._check_version(version)
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, version, key, rows):
+        """Shrani številke vrstic; prevelikih rezultatov ne shranimo."""
+        size = self._size(key, rows)
+        if size > self.max_bytes:
+            return
+        rows.flags.writeable = False
+        with self._lock:
+            self._check_version(version)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._size(key, previous)
+            self._entries[key] = rows
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_rows = self._entries.popitem(last=False)
+                self._bytes -= self._size(old_key, old_rows)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Števci za določanje velikosti predpomnilnika."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
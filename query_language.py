@@ -0,0 +1,238 @@
+"""
+Poizvedbeni jezik s polji in logičnimi operatorji.
+
+    author:Kovič AND text_type:poezija NOT spol:ž
+    character:"Tito" OR kanonična_oblika:Kardelj
+    (avtor:Rupel OR avtor:Dolenc) leto_izdaje:1968
+
+Izraz je iz členov oblike [polje:]vrednost. Polje je ime stolpca ali njegova
+slovenska oznaka iz RENAME_DICT (velike/male črke in strešice niso pomembne,
+presledke nadomestimo s podčrtajem ali oznako zapišemo v narekovajih, npr.
+"leto izdaje":1968); ime lahko vsebuje oklepaje (title_(year):1968). Vrednost brez narekovajev se išče kot podniz (delno
+ujemanje), vrednost v narekovajih pa kot cela vrednost (natančno ujemanje).
+Člen brez polja išče po vseh stolpcih. Operatorji so AND (IN), OR (ALI) in
+NOT (NE), pisani z velikimi črkami; zaporedna člena brez operatorja se
+združita z AND. Prednost: NOT pred AND pred OR, oklepaji jo spremenijo.
+
+Vsak člen se ovrednoti v urejeno polje številk vrstic (posting lista iz
+indeksov v engine.py, z enakim predpomnilnikom kot običajno iskanje). Pri AND
+najprej ovrednotimo poceni člene (natančno ujemanje je en vpogled v slovar),
+preseke pa računamo od najkrajše liste naprej in prenehamo, ko je presek prazen.
+"""
+import re
+
+import numpy as np
+
+from engine import RENAME_DICT, search_rows
+from normalization import normalize_string
+
+OPERATORS = {"AND": "AND", "IN": "AND", "OR": "OR", "ALI": "OR", "NOT": "NOT", "NE": "NOT"}
+
+_TOKEN = re.compile(
+    r'\s*(?:(?P<lparen>\()|(?P<rparen>\))'
+    r'|(?P<field>"[^"]*"|[^\s():"]+):(?=[^\s)])'
+    r'|"(?P<phrase>[^"]*)"|(?P<word>[^\s()"]+))'
+)
+
+# Ime polja z oklepaji (npr. title_(year)); pred njim so lahko začetni oklepaji izraza
+_FIELD_NAME = re.compile(r'\s*(?P<lparens>\(*)(?P<name>[^\s:"]+):')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+def field_aliases(columns):
+    """Slovar normalizirano ime ali oznaka polja -> stolpec."""
+    aliases = {}
+    for col in columns:
+        for name in (col, RENAME_DICT.get(col, col)):
+            name = normalize_string(name)
+            aliases[name] = col
+            aliases[name.replace(" ", "_")] = col
+    return aliases
+
+
+def _field_key(name):
+    return normalize_string(name).replace(" ", "_")
+
+
+def tokenize(text, aliases=None):
+    """Razdeli poizvedbo na člene; `aliases` (glej field_aliases) so znana imena polj."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _FIELD_NAME.match(text, position)
+        if match is not None and aliases and _field_key(match.group("name")) in aliases:
+            if match.end() == len(text) or text[match.end()] in " \t\n)":
+                raise QuerySyntaxError(f"Polje {match.group('name')!r} nima vrednosti.")
+            tokens.extend([("(", None)] * len(match.group("lparens")))
+            tokens.append(("field", match.group("name")))
+            position = match.end()
+            continue
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise QuerySyntaxError(f"Nepričakovan znak na mestu {position + 1}: {text[position:].strip()[:20]!r}")
+        position = match.end()
+        if match.group("lparen"):
+            tokens.append(("(", None))
+        elif match.group("rparen"):
+            tokens.append((")", None))
+        elif match.group("field") is not None:
+            tokens.append(("field", match.group("field").strip('"')))
+        elif match.group("phrase") is not None:
+            tokens.append(("phrase", match.group("phrase")))
+        elif match.group("word") in OPERATORS:
+            tokens.append((OPERATORS[match.group("word")], None))
+        elif match.group("word").endswith(":"):
+            raise QuerySyntaxError(f"Polje {match.group('word')[:-1]!r} nima vrednosti.")
+        else:
+            tokens.append(("word", match.group("word")))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens, aliases):
+        self.tokens = tokens
+        self.aliases = aliases
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise QuerySyntaxError("Poizvedba je prazna.")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Odvečen element poizvedbe: {self.tokens[self.position][1] or self.peek()}")
+        return node
+
+    def parse_or(self):
+        operands = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else ("or", operands)
+
+    def parse_and(self):
+        operands = [self.parse_not()]
+        while self.peek() not in (None, ")", "OR"):
+            if self.peek() == "AND":
+                self.take()
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else ("and", operands)
+
+    def parse_not(self):
+        if self.peek() == "NOT":
+            self.take()
+            return ("not", self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        kind = self.peek()
+        if kind == "(":
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QuerySyntaxError("Manjka zaklepaj.")
+            self.take()
+            return node
+        column = None
+        if kind == "field":
+            name = self.take()[1]
+            column = self.aliases.get(_field_key(name))
+            if column is None:
+                raise QuerySyntaxError(f"Neznano polje {name!r}.")
+            kind = self.peek()
+        if kind == "word":
+            return ("term", column, self.take()[1], False)
+        if kind == "phrase":
+            return ("term", column, self.take()[1], True)
+        if kind is None:
+            raise QuerySyntaxError("Poizvedba se nepričakovano konča.")
+        raise QuerySyntaxError(f"Nepričakovan operator ali oklepaj: {kind}")
+
+
+def parse(text, columns):
+    """Razčleni poizvedbo v drevo: ("term", stolpec, vrednost, natančno), ("and"|"or", [..]), ("not", ..)."""
+    aliases = field_aliases(columns)
+    return _Parser(tokenize(text, aliases), aliases).parse()
+
+
+def fields(node):
+    """Množica stolpcev, ki jih poizvedba uporablja (None za člene brez polja)."""
+    if node[0] == "term":
+        return {node[1]}
+    if node[0] == "not":
+        return fields(node[1])
+    return set().union(*(fields(child) for child in node[1]))
+
+
+def intersect(a, b):
+    """Presek urejenih polj brez ponovitev; pri zelo različnih dolžinah z bisekcijo."""
+    if len(a) > len(b):
+        a, b = b, a
+    if len(a) * 16 < len(b):
+        positions = np.searchsorted(b, a)
+        found = positions < len(b)
+        found[found] = b[positions[found]] == a[found]
+        return a[found]
+    return np.intersect1d(a, b, assume_unique=True)
+
+
+def _cost(node):
+    # Natančni členi so en vpogled v slovar, delni zahtevajo pregled n-gramov
+    if node[0] == "term":
+        return 0 if node[3] else 1
+    return 2
+
+
+def evaluate(dataset, node, cache=None):
+    """Ovrednoti drevo poizvedbe v urejeno polje številk vrstic (np.int32)."""
+    kind = node[0]
+    if kind == "term":
+        _, column, value, exact = node
+        return np.asarray(search_rows(dataset, value, column, exact, cache=cache), dtype=np.int32)
+    if kind == "or":
+        return np.unique(np.concatenate([evaluate(dataset, child, cache) for child in node[1]])).astype(np.int32)
+    if kind == "not":
+        return np.setdiff1d(np.arange(len(dataset.data), dtype=np.int32), evaluate(dataset, node[1], cache),
+                            assume_unique=True)
+    # AND: pozitivni členi od najcenejšega, nato preseki od najkrajšega; negacije na koncu
+    positive = sorted((child for child in node[1] if child[0] != "not"), key=_cost)
+    negative = [child[1] for child in node[1] if child[0] == "not"]
+    if not positive:
+        result = np.arange(len(dataset.data), dtype=np.int32)
+    else:
+        lists = []
+        for child in positive:
+            rows = evaluate(dataset, child, cache)
+            if len(rows) == 0:
+                return rows
+            lists.append(rows)
+        lists.sort(key=len)
+        result = lists[0]
+        for rows in lists[1:]:
+            result = intersect(result, rows)
+            if len(result) == 0:
+                return result
+    for child in negative:
+        result = np.setdiff1d(result, evaluate(dataset, child, cache), assume_unique=True)
+        if len(result) == 0:
+            break
+    return result.astype(np.int32)
+
+
+def search_query(dataset, text, cache=None):
+    """Številke vrstic (urejene), ki ustrezajo poizvedbi v poizvedbenem jeziku.
+
+    Ob napaki v zapisu poizvedbe sproži QuerySyntaxError (z opisom v slovenščini).
+    """
+    return evaluate(dataset, parse(text, dataset.valid_columns), cache)
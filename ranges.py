@@ -0,0 +1,92 @@
+"""
+Številski stolpci 'year' in 'birth' z intervalnimi poizvedbami.
+
+Ob nalaganju vsako celico enkrat razčlenimo v cela števila: 'year' številsko
+(pd.to_numeric, prazne celice so brez vrednosti), 'birth' pa ima lahko več
+vrednosti, ločenih s ';' (npr. "1946; 1945"). Stolpec je predstavljen v obliki
+CSR: vrednosti vrstice r so values[offsets[r]:offsets[r + 1]]. Za vsak stolpec
+hranimo pare (vrednost, vrstica), urejene po vrednosti; interval [od, do]
+poiščemo z dvema bisekcijama (np.searchsorted) v O(log n), nato le preberemo
+ustrezni odsek.
+
+    years = dataset.ranges["year"]
+    rows = years.rows(1968, 1972)                    # urejene številke vrstic
+    rows = years.filter(rows_from_search, 1968, 1972)
+"""
+import numpy as np
+import pandas as pd
+
+RANGE_COLUMNS = ["year", "birth"]
+
+
+def parse_numbers(values):
+    """Razčleni celice z vrednostmi, ločenimi s ';', v cela števila; vrne (offsets, values) v obliki CSR."""
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    numbers = []
+    for position, value in enumerate(values):
+        if value is not None:
+            numbers.extend(int(part) for part in str(value).split(";") if part.strip().isdigit())
+        offsets[position + 1] = len(numbers)
+    return offsets, np.asarray(numbers, dtype=np.int32)
+
+
+def parse_number(series):
+    """Razčleni stolpec z največ eno številsko vrednostjo na celico (npr. "1968.0" ali Int16)."""
+    numbers = pd.to_numeric(series, errors="coerce")
+    present = numbers.notna().to_numpy()
+    offsets = np.zeros(len(series) + 1, dtype=np.int64)
+    np.cumsum(present, out=offsets[1:])
+    return offsets, numbers[present].to_numpy(dtype=np.float64).astype(np.int32)
+
+
+class RangeIndex:
+    """Urejeni pari (vrednost, vrstica) enega številskega stolpca (iz parse_numbers ali parse_number)."""
+
+    def __init__(self, offsets, values):
+        self.offsets, self.values = offsets, values
+        self.multi_valued = bool((np.diff(self.offsets) > 1).any())
+        rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(self.offsets))
+        order = np.lexsort((rows, self.values))
+        self.sorted_values = self.values[order]
+        self.sorted_rows = rows[order]
+
+    @property
+    def bounds(self):
+        """(najmanjša, največja) vrednost ali None, če je stolpec prazen."""
+        if not len(self.sorted_values):
+            return None
+        return int(self.sorted_values[0]), int(self.sorted_values[-1])
+
+    def at(self, position):
+        """Vse vrednosti vrstice (seznam celih števil)."""
+        return self.values[self.offsets[position]:self.offsets[position + 1]].tolist()
+
+    def _span(self, low, high):
+        # Dve bisekciji: odsek urejenih parov z vrednostjo v [low, high]
+        start = 0 if low is None else np.searchsorted(self.sorted_values, low, side="left")
+        stop = len(self.sorted_values) if high is None else np.searchsorted(self.sorted_values, high, side="right")
+        return self.sorted_rows[start:stop]
+
+    def rows(self, low=None, high=None):
+        """Urejene številke vrstic z vsaj eno vrednostjo v [low, high] (None: brez meje)."""
+        # Odsek je urejen po vrednosti; vrstice uredimo (in pri 'birth' odstranimo ponovitve)
+        return np.unique(self._span(low, high))
+
+    def filter(self, rows, low=None, high=None):
+        """Ohrani le vrstice iz `rows` (vrstni red se ohrani), ki imajo vrednost v [low, high]."""
+        if low is None and high is None:
+            return rows
+        rows = np.asarray(rows, dtype=np.int32)
+        mask = np.zeros(len(self.offsets) - 1, dtype=bool)
+        mask[self._span(low, high)] = True
+        return rows[mask[rows]]
+
+
+def build_range_indexes(dataset):
+    """RangeIndex za vse številske stolpce, ki jih ima Dataset."""
+    indexes = {}
+    if "year" in dataset.data.columns:
+        indexes["year"] = RangeIndex(*parse_number(dataset.data["year"]))
+    if "birth" in dataset.data.columns:
+        indexes["birth"] = RangeIndex(*parse_numbers(dataset.display_column("birth")))
+    return indexes
@@ -0,0 +1,93 @@
+"""
+Razvrščanje zadetkov po ustreznosti.
+
+Vsaka celica, v kateri je poizvedba, dobi razred ujemanja: celotna vrednost
+(EXACT) pred začetkom vrednosti (PREFIX), pred začetkom besede (WORD) in pred
+poljubnim podnizom (SUBSTRING). Razred ima prednost, med enakimi razredi pa
+odloči utež polja: 'character' in 'real_char' pred 'lemma'/'surface', pred
+'author' in 'title_(year)'; vsa druga polja (npr. 'publication') imajo
+najmanjšo utež. Ocena vrstice je najboljša ocena njenih celic.
+
+Razred izračunamo le za vrednosti slovarja, ki poizvedbo vsebujejo (iz
+indeksa n-gramov, enako kot pri iskanju), ocene celic pa so potem le
+indeksiranje po kodah vrednosti. Izbor najboljših k vrstic je delno urejanje
+(np.argpartition, O(n)) in urejanje le teh k vrstic (O(k log k)). Pri enaki
+oceni ostane izvorni vrstni red.
+
+    rows = search_rows(dataset, "Zobec")
+    top = rank_rows(dataset, rows, "zobec", k=50)
+"""
+import re
+
+import numpy as np
+
+from engine import substring_matches
+
+SUBSTRING, WORD, PREFIX, EXACT = 1, 2, 3, 4
+
+FIELD_WEIGHTS = {
+    "character": 5,
+    "real_char": 5,
+    "lemma": 4,
+    "surface": 4,
+    "author": 3,
+    "title_(year)": 2,
+}
+DEFAULT_WEIGHT = 1
+
+# Ocena = razred * WEIGHT_SPAN + utež, zato razred vedno prevlada nad utežjo
+WEIGHT_SPAN = max(FIELD_WEIGHTS.values()) + 1
+
+
+def match_class(value, normalized_query):
+    """Razred ujemanja normalizirane vrednosti s poizvedbo (0, če je ne vsebuje)."""
+    if value == normalized_query:
+        return EXACT
+    if value.startswith(normalized_query):
+        return PREFIX
+    if normalized_query not in value:
+        return 0
+    if re.search(r"(?<!\w)" + re.escape(normalized_query), value):
+        return WORD
+    return SUBSTRING
+
+
+def vocabulary_classes(index, normalized_query):
+    """Razred ujemanja za vsako vrednost slovarja (np.int16, večina je 0)."""
+    classes = np.zeros(len(index["vocabulary"]), dtype=np.int16)
+    vocabulary = index["vocabulary"]
+    # Razred računamo le za vrednosti, ki poizvedbo vsebujejo (presek posting list n-gramov)
+    for code in np.flatnonzero(substring_matches(index, normalized_query)).tolist():
+        classes[code] = match_class(vocabulary[code], normalized_query)
+    return classes
+
+
+def score_rows(dataset, rows, normalized_query, column=None):
+    """Ocene vrstic `rows` (np.int16, 0 pomeni, da se nobena celica ne ujema)."""
+    index = dataset.ngram_index
+    classes = vocabulary_classes(index, normalized_query)
+    rows = np.asarray(rows, dtype=np.int32)
+    scores = np.zeros(len(rows), dtype=np.int16)
+    for col in [column] if column else index["columns"]:
+        column_classes = classes[index["codes"][index["columns"][col]][rows]]
+        # Prazne celice (normalizirane kot "nan") niso zadetek
+        column_classes[~index["present"][col][rows]] = 0
+        weight = FIELD_WEIGHTS.get(col, DEFAULT_WEIGHT)
+        np.maximum(scores, np.where(column_classes > 0, column_classes * WEIGHT_SPAN + weight, 0), out=scores)
+    return scores
+
+
+def top_k(rows, scores, k=None):
+    """Vrstice, urejene po padajoči oceni (ob enakosti po vrstici); le prvih k, če k ni None."""
+    rows = np.asarray(rows, dtype=np.int32)
+    # En ključ na vrstico (ocena, nato vrstica), da je tudi delni izbor pri enakih ocenah enoličen
+    stride = int(rows.max(initial=0)) + 1
+    keys = (int(scores.max(initial=0)) - scores.astype(np.int64)) * stride + rows
+    if k is not None and k < len(keys):
+        keys = keys[np.argpartition(keys, k - 1)[:k]] if k > 0 else keys[:0]
+    return (np.sort(keys) % stride).astype(np.int32)
+
+
+def rank_rows(dataset, rows, normalized_query, column=None, k=None):
+    """Zadetki, razvrščeni po ustreznosti (glej zgoraj); največ k vrstic, če k ni None."""
+    return top_k(rows, score_rows(dataset, rows, normalized_query, column), k)
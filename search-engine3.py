@@ -1,78 +1,83 @@
-import pandas as pd
+import functools
+import os
+
+import numpy as np
 import streamlit as st
-import unicodedata
+
+from engine import RENAME_DICT, details, has_details, refine_search, search_rows
+from export import FORMATS, export_buffer
+from facets import FACET_COLUMNS
+from fuzzy import MAX_DISTANCE
+from normalization import normalize_string
+from query_cache import QueryCache
+from query_language import QuerySyntaxError, evaluate, fields, parse
+from ranking import rank_rows
+from snapshot import SHEET, format_for_display
+from timing import NULL_TIMER, StageStats, Timer
+from watcher import PATTERN, DatasetWatcher
 
 # Nastavi konfiguracijo strani na široko postavitev
 st.set_page_config(page_title="Iskalnik po bazi lastnih imen korpusa Maj68")
 
-def normalize_string(s):
-    if not isinstance(s, str):
-        return s
-    s = unicodedata.normalize('NFKD', s)
-    return ''.join(c for c in s if not unicodedata.combining(c)).lower()
-
 # Naslednji naslov aplikacije
 st.title("Iskalnik po bazi lastnih imen korpusa Maj68")
 
-# Naloži podatke z uporabo st.cache_data za učinkovito predpomnjenje
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_excel("LIST_type=person_2025-02-12-iskalnik.xlsx", sheet_name="Sheet1")
-    except ValueError:
-        st.error("Napaka: Delovni list 'Sheet1' ni najden v datoteki.")
-        return pd.DataFrame()
-    
-    # === Preprocessing Comments (Section 3.3) ===
-    # Za vsak vrstico, kjer je 'comment' neprazen:
-    # 1. Shranimo originalno vrednost 'character' v začasni stolpec.
-    # 2. Nadomestimo 'character' z vrednostjo iz 'real_char'.
-    # 3. K 'comment' dodamo originalno vrednost 'character'.
-    mask = df['comment'].notna()
-    df.loc[mask, 'original_character'] = df.loc[mask, 'character']
-    df.loc[mask, 'character'] = df.loc[mask, 'real_char']
-    df.loc[mask, 'comment'] = df.loc[mask, 'original_character'].astype(str) + ": " + df.loc[mask, 'comment'].astype(str)
-    df.drop(columns=['original_character'], inplace=True)
-    # ===========================================
-    
-    return df
-
-data = load_data()
-
-# Zagotovi pravilno prikazovanje stolpcev 'year' in 'birth'
-if "year" in data.columns:
-    data["year"] = pd.to_numeric(data["year"], errors="coerce").fillna("").astype(str)
-if "birth" in data.columns:
-    data["birth"] = data["birth"].apply(
-        lambda x: '; '.join([str(int(y)) for y in str(x).split(';') if y.strip().isdigit()]) if pd.notna(x) else ""
-    )
+# Kompaktni način (kategorije namesto nizov) vklopimo z MAJ68_COMPACT=1, kadar
+# na istem strežniku teče več procesov aplikacije.
+COMPACT = os.environ.get("MAJ68_COMPACT", "") not in ("", "0")
+
+# Kako pogosto (v sekundah) preverimo, ali je v mapi nov ali spremenjen izvoz
+# LIST_type=person_<datum>-iskalnik.xlsx; 0 izklopi samodejno nalaganje.
+RELOAD_INTERVAL = int(os.environ.get("MAJ68_RELOAD_INTERVAL", "60"))
+
+# Merjenje časa faz (zapis v dnevnik in stranski pano) vklopimo z MAJ68_DEBUG=1
+# za ves proces ali s parametrom ?debug=1 v naslovu strani za posamezno sejo.
+DEBUG = (
+    os.environ.get("MAJ68_DEBUG", "") not in ("", "0")
+    or st.query_params.get("debug", "") not in ("", "0")
+)
+timer = Timer(enabled=DEBUG)
+
+# Časi faz vseh izvajanj v procesu (p50, p95)
+@st.cache_resource
+def get_stage_stats():
+    return StageStats()
 
-# Definiraj seznam stolpcev, ki jih NE želimo prikazovati in ki ne smejo biti na voljo kot možnosti iskanja
-excluded_columns = ['id', 'lemma', 'surface', 'comment', 'real_char', 'real_link']
-
-# Očisti imena stolpcev, da odstraniš neveljavne možnosti (tudi tiste, ki so samo "#")
-valid_columns = [col for col in data.columns if col not in excluded_columns and col.strip() != "#"]
-
-# Slovenski prevodi stolpcev za prikaz:
-rename_dict = {
-    "title_(year)": "naslov",
-    "text_id": "id teksta",
-    "author": "avtor",
-    "publication": "publikacija",
-    "gender": "spol",
-    "subtype": "podtip",
-    "type": "tip",
-    "birth": "leto rojstva",
-    "text_type": "zvrst",
-    "year": "leto izdaje",
-    "character": "kanonična oblika"  # spremenjeno iz "protagonist"
-}
-
-# Normaliziraj podatke za predloge za samodejno dopolnjevanje
-normalized_data = data.applymap(normalize_string)
+# Naloži najnovejši izvoz in indekse enkrat na proces (glej engine.py, snapshot.py
+# in watcher.py); vse seje si delijo isti, nespremenljiv Dataset, ki ga nit v
+# ozadju ob novem izvozu zamenja z novim. Faze nalaganja izmeri le prvo
+# izvajanje (_timer se ne upošteva pri ključu predpomnilnika).
+@st.cache_resource
+def get_watcher(compact=False, _timer=NULL_TIMER):
+    return DatasetWatcher(".", sheet=SHEET, compact=compact, interval=RELOAD_INTERVAL).start(_timer)
+
+try:
+    with timer.span("load"):
+        watcher = get_watcher(COMPACT, _timer=timer)
+except FileNotFoundError:
+    st.error(f"Napaka: V mapi ni datoteke {PATTERN}.")
+    st.stop()
+except ValueError:
+    st.error(f"Napaka: Delovni list '{SHEET}' ni najden v datoteki.")
+    st.stop()
+
+# Dataset preberemo enkrat na izvajanje, da ima seja dosleden pogled na podatke
+dataset = watcher.dataset
+if st.session_state.get("dataset_version") not in (None, dataset.version):
+    st.info("Podatki so bili medtem posodobljeni; rezultati ustrezajo novi različici.")
+st.session_state.dataset_version = dataset.version
+
+data = dataset.data
+valid_columns = dataset.valid_columns
+rename_dict = RENAME_DICT
 
 # Tip iskanja
-search_type = st.radio("Način iskanja:", ["Globalno iskanje", "Iskanje v določenem polju"])
+search_type = st.radio(
+    "Način iskanja:", ["Globalno iskanje", "Iskanje v določenem polju", "Napredno iskanje", "Iskanje oseb"]
+)
+advanced = search_type == "Napredno iskanje"
+# Iskanje oseb pregleda tabelo entitet (ena vrstica za kanonično obliko), ne omemb
+entity_mode = search_type == "Iskanje oseb"
 
 # === Specific Column Selection (Section 7.2) ===
 # Uporabi slovenske imenske oznake, pridobljene iz rename_dict.
@@ -80,12 +85,58 @@ if search_type == "Iskanje v določenem polju":
     options = {rename_dict.get(col, col): col for col in valid_columns}
     selected_slov = st.selectbox("Izberi stolpec za iskanje:", list(options.keys()))
     column = options[selected_slov]
+elif entity_mode:
+    column = "character"
 else:
     column = None
 # ==========================================
 
-# Izbira načina ujemanja
-match_type = st.radio("Vrsta ujemanja:", ["Delno ujemanje", "Natančno ujemanje"])
+# Izbira načina ujemanja (pri naprednem iskanju ga določajo narekovaji)
+if advanced:
+    st.caption(
+        'Poizvedba s polji in operatorji AND, OR, NOT ter oklepaji, npr. '
+        '`avtor:Rupel AND zvrst:poezija NOT spol:ž` ali `kanonična_oblika:"Tito" OR kanonična_oblika:Kardelj`. '
+        'Vrednost v narekovajih se mora ujemati v celoti, sicer zadošča del vrednosti.'
+    )
+    match_type = None
+elif entity_mode:
+    match_type = st.radio("Vrsta ujemanja:", ["Delno ujemanje", "Natančno ujemanje"])
+else:
+    match_type = st.radio("Vrsta ujemanja:", ["Delno ujemanje", "Natančno ujemanje", "Približno ujemanje"])
+
+# Pri približnem ujemanju (tipkarske napake) izberemo največje število napak
+if match_type == "Približno ujemanje":
+    distance = st.slider("Največje število napak:", min_value=1, max_value=MAX_DISTANCE, value=1)
+else:
+    distance = None
+
+# Razvrščanje po ustreznosti (glej ranking.py); približno ujemanje je vedno urejeno po številu napak
+if not advanced and not entity_mode and distance is None:
+    order = st.radio("Razvrsti zadetke:", ["Po ustreznosti", "Po vrstnem redu v seznamu"], horizontal=True)
+else:
+    order = None
+by_relevance = order == "Po ustreznosti"
+
+# Možne velikosti strani rezultatov
+PAGE_SIZES = [25, 50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 50
+
+# Paginacija: v brskalnik pošljemo le vrstice in expanderje trenutne strani
+def paginate(total, key):
+    """Izbira velikosti in številke strani; vrne (začetek, konec) prikazanih zadetkov."""
+    page_size = st.selectbox("Zadetkov na stran:", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE))
+    page_count = -(-total // page_size)
+    page = 1
+    if page_count > 1:
+        # Ključ vsebuje poizvedbo in nastavitve, da se ob novem iskanju vrnemo na prvo stran
+        page = st.number_input(
+            f"Stran (od {page_count}):", min_value=1, max_value=page_count, value=1, step=1,
+            key=f"page:{key}:{page_size}",
+        )
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    st.caption(f"Prikazani zadetki {start + 1}–{stop}.")
+    return start, stop
 
 # Vnos poizvedbe
 if "query_input" not in st.session_state:
@@ -93,95 +144,220 @@ if "query_input" not in st.session_state:
 
 query_input = st.text_input("Išči:", value=st.session_state.query_input)
 
-def search_data(dataframe, query, column=None, exact=False):
-    normalized_query = normalize_string(query)
-    if column:
-        # Če iščemo po kanonični obliki, poišči samo po 'character' (ignoriramo 'real_char')
-        if column == "character":
-            if exact:
-                mask = dataframe['character'].astype(str).apply(normalize_string) == normalized_query
-            else:
-                mask = dataframe['character'].astype(str).apply(normalize_string).str.contains(normalized_query, na=False)
-            return dataframe[mask]
-        else:
-            col_data = dataframe[column].dropna().astype(str)
-            if exact:
-                return dataframe[col_data.apply(normalize_string) == normalized_query]
-            else:
-                return dataframe[col_data.apply(normalize_string).str.contains(normalized_query, na=False)]
+# Predlogi za samodejno dopolnjevanje (po predponi, urejeni po pogostosti v korpusu)
+MAX_SUGGESTIONS = 5
+
+def choose_suggestion(value):
+    st.session_state.query_input = value
+
+if query_input and not advanced:
+    normalized_input = normalize_string(query_input)
+    with timer.span("autocomplete"):
+        suggestions = [
+            (value, col) for value, col, _ in dataset.autocomplete.suggest(query_input, column, limit=MAX_SUGGESTIONS + 1)
+            if normalize_string(value) != normalized_input
+        ][:MAX_SUGGESTIONS]
+    if suggestions:
+        st.write("Predlogi:")
+        for i, (value, col) in enumerate(suggestions):
+            label = value if column else f"{value} (iz {rename_dict.get(col, col)})"
+            st.button(label, key=f"suggestion_{i}", on_click=choose_suggestion, args=(value,))
+
+# Predpomnilnik rezultatov je skupen vsem sejam v procesu
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(max_entries=1024, max_bytes=64 * 1024 * 1024)
+
+query_cache = get_query_cache()
+
+if query_input and entity_mode:
+    with timer.span("search"):
+        matches = dataset.entities.search(query_input, exact=match_type == "Natančno ujemanje")
+    results = matches
+    if matches:
+        st.write(f"Najdenih {len(matches)} oseb:")
+        start, stop = paginate(len(matches), f"entities:{query_input}:{match_type}")
+        page_entities = [dataset.entities.entities[i] for i in matches[start:stop]]
+
+        with timer.span("table"):
+            st.dataframe([
+                {
+                    "kanonična oblika": entity["name"],
+                    "omembe": entity["mentions"],
+                    "besedila": len(entity["texts"]),
+                    "avtorji": ", ".join(entity["authors"]),
+                    "leta izdaje": ", ".join(entity["years"]),
+                }
+                for entity in page_entities
+            ])
+
+        # Podrobnosti osebe; omembe (vrstice seznama) izrišemo šele na zahtevo
+        with timer.span("details"):
+            for entity in page_entities:
+                expander = st.expander(
+                    f"{entity['name']} ({entity['mentions']} omemb v {len(entity['texts'])} besedilih)"
+                )
+                if entity["real_chars"]:
+                    expander.write(f"Izvirna oblika: {', '.join(entity['real_chars'])}")
+                expander.write(f"Variacije imen: {', '.join(entity['variants'])}")
+                comment_text = "; ".join(entity["comments"]) or "Ni komentarja."
+                expander.write(f"Komentar: {comment_text}")
+                if entity["real_link"]:
+                    expander.markdown(f"[Več informacij na Wikipediji]({entity['real_link']})")
+                expander.write("Besedila: " + "; ".join(f"{title} ({text_id})" for text_id, title in entity["texts"]))
+                if expander.toggle("Prikaži omembe", key=f"mentions:{entity['key']}"):
+                    mentions = data.iloc[entity["rows"]]
+                    expander.dataframe(format_for_display(mentions[valid_columns]).rename(columns=rename_dict))
     else:
-        if exact:
-            mask = dataframe.apply(lambda row: any(normalized_query == normalize_string(str(value)) for value in row), axis=1)
-        else:
-            mask = dataframe.apply(lambda row: any(normalized_query in normalize_string(str(value)) for value in row), axis=1)
-        return dataframe[mask]
+        st.write("Ni najdenih rezultatov.")
 
-if query_input:
+elif query_input:
     exact = match_type == "Natančno ujemanje"
-    results = search_data(data, query_input, column, exact)
+    # Normalizirana poizvedba (za razvrščanje in podrobnosti pri globalnem iskanju)
+    normalized_query = normalize_string(query_input)
+    # Pri naprednem iskanju podrobnosti prikažemo, če poizvedba išče po kanonični obliki ali po vseh stolpcih
+    show_details = True
+    with timer.span("search"):
+        if advanced:
+            try:
+                tree = parse(query_input, valid_columns)
+                rows = evaluate(dataset, tree, cache=query_cache)
+                show_details = bool(fields(tree) & {None, "character"})
+            except QuerySyntaxError as error:
+                st.error(f"Napaka v poizvedbi: {error}")
+                rows = np.empty(0, dtype=np.int32)
+        elif not exact and distance is None:
+            # Ob dopolnjevanju poizvedbe (npr. "mar" -> "mari") preverimo le prejšnje zadetke
+            refinement = refine_search(
+                dataset, query_input, column, st.session_state.get("refinement"), cache=query_cache
+            )
+            st.session_state.refinement = refinement
+            rows = refinement["rows"]
+        else:
+            rows = search_rows(dataset, query_input, column, exact, cache=query_cache, distance=distance)
+
+    # Intervala za leto izdaje in leto rojstva (bisekcija po urejenem indeksu, glej ranges.py);
+    # celoten interval pomeni brez omejitve, zato ostanejo tudi vrstice brez vrednosti
+    st.sidebar.header("Filtri")
+    ranges = {}
+    for col, index in dataset.ranges.items():
+        bounds = index.bounds
+        if bounds is None or bounds[0] == bounds[1]:
+            continue
+        key = f"range:{col}"
+        low, high = st.session_state.get(key, bounds)
+        # Po zamenjavi podatkov se meje lahko spremenijo
+        low, high = max(low, bounds[0]), min(high, bounds[1])
+        st.session_state[key] = (low, high) if low <= high else bounds
+        low, high = st.sidebar.slider(rename_dict.get(col, col), *bounds, key=key)
+        if (low, high) != bounds:
+            ranges[col] = (low, high)
+            with timer.span("ranges"):
+                rows = index.filter(rows, low, high)
+
+    # Filtri v stranski vrstici (fasete): izbire preberemo pred izrisom, da lahko
+    # ob vsaki vrednosti prikažemo število zadetkov, ki ga da dodajanje te vrednosti
+    selections = {}
+    for col in FACET_COLUMNS:
+        key = f"facet:{col}"
+        # Po zamenjavi podatkov nekaterih vrednosti morda ni več
+        selections[col] = st.session_state[key] = [
+            value for value in st.session_state.get(key, []) if value in dataset.facets.bitsets[col]
+        ]
+    with timer.span("facets"):
+        rows, facet_counts = dataset.facets.apply(rows, selections)
+    for col in FACET_COLUMNS:
+        st.sidebar.multiselect(
+            rename_dict.get(col, col), dataset.facets.values(col), key=f"facet:{col}",
+            format_func=lambda value, counts=facet_counts[col]: f"{value} ({counts[value]})",
+        )
+    results = data.iloc[rows]
     if not results.empty:
         st.write(f"Najdenih {len(results)} rezultatov:")
-        
+
+        # Izvoz vseh zadetkov; datoteka se pripravi šele ob kliku (po kosih, brez vmesnih tabel)
+        export_col1, export_col2 = st.columns([1, 3])
+        export_format = export_col1.selectbox("Izvoz:", list(FORMATS), label_visibility="collapsed")
+        export_rows = functools.partial(rank_rows, dataset, rows, normalized_query, column) if by_relevance else (
+            lambda: rows
+        )
+        export_col2.download_button(
+            f"Prenesi zadetke ({export_format.upper()})",
+            data=lambda: export_buffer(dataset, export_rows(), export_format),
+            file_name=f"zadetki{FORMATS[export_format][1]}",
+            mime=FORMATS[export_format][0],
+            on_click="ignore",
+        )
+        if distance is not None:
+            st.caption("Zadetki so urejeni po številu napak glede na poizvedbo.")
+
+        start, stop = paginate(
+            len(results), f"{query_input}:{column}:{match_type}:{distance}:{order}:{ranges}:{selections}"
+        )
+        # Pri razvrščanju po ustreznosti izberemo le najboljših `stop` zadetkov (delno urejanje)
+        with timer.span("rank"):
+            shown = rank_rows(dataset, rows, normalized_query, column, k=stop) if by_relevance else rows[:stop]
+        page_results = data.iloc[shown[start:]]
+
         # Prikaz rezultatov: uporabimo samo dovoljene stolpce in jih preimenujemo v slovenščino
-        display_results = results[valid_columns].rename(columns=rename_dict)
-        st.dataframe(display_results)
-        
-        # Če imamo več zadetkov istega 'text_id', prikažemo le enega
-        if 'text_id' in results.columns:
-            results_unique = results.drop_duplicates(subset=["text_id"])
-        else:
-            results_unique = results
-
-        # Pripravi normalizirano iskalno poizvedbo (uporabimo jo pri globalnem iskanju)
-        normalized_query = normalize_string(query_input)
-        
-        # Prikaz dodatnih informacij za vsak unikatni zapis (expander)
-        for _, row in results_unique.iterrows():
-            canonical = row['character']
-            author_val = row["author"] if "author" in row.index else ""
-            title_val = row["title_(year)"] if "title_(year)" in row.index else ""
-            
-            # Pogoji za prikaz expanderja:
-            #  - Če je globalno iskanje in se iskani niz nahaja v 'character'
-            #  - Ali pa je izbrano iskanje v določenem polju in je ta stolpec 'character'
-            show_expander = False
-            if search_type == "Globalno iskanje":
-                if normalized_query in normalize_string(str(row['character'])):
-                    show_expander = True
-            elif search_type == "Iskanje v določenem polju" and column == "character":
-                show_expander = True
-
-            if show_expander:
-                # Pridobi expander z dodatnimi informacijami.
-                expander = st.expander(f"{canonical} ({author_val}: {title_val})")
-                
-                # Izpiši tudi vrednost, ki je v stolpcu 'real_char'
-                if pd.notna(row.get('real_char')):
-                    expander.write(f"Izvirna oblika: {row['real_char']}")
-                
-                # Spremenjena maska (Section 10.4)
-                mask = (data["title_(year)"] == row["title_(year)"]) & (
-                    data['character'].astype(str).apply(
-                        lambda x: normalize_string(x) == normalize_string(canonical)
-                    )
+        with timer.span("table"):
+            display_results = format_for_display(page_results[valid_columns]).rename(columns=rename_dict)
+            st.dataframe(display_results)
+
+        with timer.span("details"):
+            # Če imamo več zadetkov istega 'text_id', prikažemo le enega, in sicer na
+            # strani, kjer se ta 'text_id' med rezultati pojavi prvič
+            if 'text_id' in results.columns:
+                first_hits = ~data["text_id"].iloc[shown].duplicated().to_numpy()
+                results_unique = page_results[first_hits[start:]]
+            else:
+                results_unique = page_results
+
+            # Prikaz dodatnih informacij za vsak unikatni zapis (expander), če se iskani
+            # niz pri globalnem iskanju nahaja v 'character' ali če iščemo v polju 'character'
+            for label in results_unique.index:
+                if not show_details or not has_details(
+                    dataset, label, normalized_query, column, fuzzy=advanced or distance is not None
+                ):
+                    continue
+                info = details(dataset, label)
+                expander = st.expander(
+                    f"{data.at[label, 'character']} ({data.at[label, 'author']}: {data.at[label, 'title_(year)']})"
                 )
-                
-                # Zberi variacije imen iz stolpcev 'lemma' in 'surface'
-                lemmas = data.loc[mask, 'lemma'].dropna().astype(str).unique()
-                surfaces = data.loc[mask, 'surface'].dropna().astype(str).unique()
-                variations = set(list(lemmas) + list(surfaces))
-                
-                expander.write(f"Variacije imen: {', '.join(variations)}")
-                comment_text = row['comment'] if pd.notna(row['comment']) else "Ni komentarja."
+
+                # Izpiši tudi vrednost, ki je v stolpcu 'real_char'
+                if info["real_char"] is not None:
+                    expander.write(f"Izvirna oblika: {info['real_char']}")
+
+                # Variacije imen, komentar in povezava iz vnaprej zgrajenih skupin
+                expander.write(f"Variacije imen: {', '.join(info['variations'])}")
+                comment_text = "; ".join(info["comments"]) or "Ni komentarja."
                 expander.write(f"Komentar: {comment_text}")
-                
-                wiki_link = row['real_link']
-                # Povezavo prikaži le, če je URL veljaven (npr. se začne z "http")
-                if isinstance(wiki_link, str) and wiki_link.strip().startswith("http"):
-                    expander.markdown(f"[Več informacij na Wikipediji]({wiki_link.strip()})")
+
+                if info["real_link"]:
+                    expander.markdown(f"[Več informacij na Wikipediji]({info['real_link']})")
     else:
         st.write("Ni najdenih rezultatov.")
 
+# Časi faz tega izvajanja, zbirni časi procesa in števci predpomnilnika rezultatov
+# (za določanje njegove velikosti) le v načinu za razhroščevanje
+if DEBUG:
+    stage_stats = get_stage_stats()
+    timer.emit(
+        stage_stats, query_length=len(query_input), column=column,
+        exact=match_type == "Natančno ujemanje", distance=distance, results=len(results) if query_input else None,
+    )
+    with st.sidebar.expander("Časi izvajanja", expanded=True):
+        st.write("To izvajanje (ms):")
+        st.json({name: round(ms, 2) for name, ms in timer.stages.items()})
+        st.write("Vsa izvajanja v procesu:")
+        st.table([
+            {"faza": name, "n": stat["n"], "p50 (ms)": round(stat["p50_ms"], 2), "p95 (ms)": round(stat["p95_ms"], 2)}
+            for name, stat in stage_stats.summary().items()
+        ])
+    with st.sidebar.expander("Predpomnilnik poizvedb"):
+        st.json(query_cache.stats())
+
 # Insert dividing line with spacing before and after
 st.markdown("<br>", unsafe_allow_html=True)
 st.markdown("---")
@@ -195,6 +371,7 @@ with col1:
         "inovacijsko dejavnost Republike Slovenije v okviru raziskovalne infrastrukture "
         "[DARIAH.SI](http://dariah.si/)."
     )
+    st.caption(f"Različica podatkov: {os.path.basename(dataset.source)} ({dataset.version[:12]})")
 with col2:
     st.image(
         "https://raw.githubusercontent.com/andrejt64/maj68-search_engine/main/DARIAH-SI_logo_CMYK.jpg",
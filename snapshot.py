@@ -0,0 +1,266 @@
+"""
+Stolpčni binarni posnetek (Arrow/Feather) seznama oseb.
+
+Branje Excel datoteke prek openpyxl je počasno, zato delovni list enkrat
+preberemo, preobdelamo (komentarji, 'real_char', 'year', 'birth'), dodamo
+normalizirane stolpce in vse skupaj shranimo v nestisnjeno datoteko Feather,
+ki jo ob zagonu preslikamo v pomnilnik. Posnetek se samodejno zgradi znova,
+ko se izvorni datoteki .xlsx spremeni čas spremembe in vsebina (SHA-256), ali
+ko ga zahteva druga predobdelava (glej prepare_name).
+
+Posnetek lahko zgradimo tudi vnaprej (npr. ob gradnji vsebnika):
+
+    python snapshot.py [pot/do/datoteke.xlsx] [ime_lista]
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from normalization import normalize_series
+
+SOURCE = "LIST_type=person_2025-02-12-iskalnik.xlsx"
+SHEET = "Sheet1"
+
+# Umask procesa (os.umask ga lahko le nastavi, zato ga preberemo enkrat ob uvozu)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Različica oblike posnetka; ob spremembi predobdelave jo povečamo, da se stari posnetki zgradijo znova
+SNAPSHOT_FORMAT = 2
+
+# Predpona imen normaliziranih ("senčnih") stolpcev v posnetku
+NORMALIZED_PREFIX = "__normalized__:"
+
+# Stolpci z malo različnimi vrednostmi, ki jih v kompaktnem načinu hranimo kot
+# kategorije (celoštevilske kode + slovar vrednosti).
+CATEGORICAL_COLUMNS = [
+    "gender", "type", "subtype", "text_type", "publication", "author", "title_(year)", "text_id", "birth",
+]
+
+
+def snapshot_path(source):
+    """Pot do posnetka, ki pripada izvorni datoteki."""
+    return os.path.splitext(source)[0] + ".snapshot.feather"
+
+
+def read_workbook(source=SOURCE, sheet=SHEET, prepare=None):
+    """Prebere delovni list in izvede vso predobdelavo (privzeto preprocess). Vrne DataFrame."""
+    return (prepare or preprocess)(pd.read_excel(source, sheet_name=sheet))
+
+
+def preprocess(df):
+    """Predobdelava prebranega delovnega lista (spremeni in vrne df)."""
+    # === Preprocessing Comments (Section 3.3) ===
+    # Za vsak vrstico, kjer je 'comment' neprazen:
+    # 1. Shranimo originalno vrednost 'character' v začasni stolpec.
+    # 2. Nadomestimo 'character' z vrednostjo iz 'real_char'.
+    # 3. K 'comment' dodamo originalno vrednost 'character'.
+    mask = df['comment'].notna()
+    df.loc[mask, 'original_character'] = df.loc[mask, 'character']
+    df.loc[mask, 'character'] = df.loc[mask, 'real_char']
+    df.loc[mask, 'comment'] = df.loc[mask, 'original_character'].astype(str) + ": " + df.loc[mask, 'comment'].astype(str)
+    df.drop(columns=['original_character'], inplace=True)
+    # ===========================================
+
+    # Zagotovi pravilno prikazovanje stolpcev 'year' in 'birth'
+    if "year" in df.columns:
+        # Celo število tudi, če kakšna celica manjka (sicer bi bila leta "1968.0"), enako kot format_for_display
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64").astype("string").fillna("").astype(str)
+    if "birth" in df.columns:
+        df["birth"] = df["birth"].apply(
+            lambda x: '; '.join([str(int(y)) for y in str(x).split(';') if y.strip().isdigit()]) if pd.notna(x) else ""
+        )
+    return df
+
+
+def normalize_frame(df):
+    """Normalizirane "senčne" stolpce za vse stolpce (prazne celice kot niz "nan")."""
+    return pd.DataFrame({col: normalize_series(df[col]) for col in df.columns}, index=df.index)
+
+
+def compact_frame(df, normalized):
+    """Kompaktna predstavitev: kategorije namesto nizov, 'year' kot Int16.
+
+    Normalizirane stolpce izračunamo pred pretvorbo, zato so rezultati iskanja
+    enaki; 'year' se v niz pretvori šele ob prikazu (glej format_for_display).
+    """
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    if "year" in df.columns:
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int16")
+    normalized = normalized.astype(
+        {col: "category" for col in CATEGORICAL_COLUMNS + ["year"] if col in normalized.columns}
+    )
+    return df, normalized
+
+
+def format_for_display(df):
+    """Vrne stolpce v obliki za prikaz: 'year' kot niz brez decimalk, prazno, če manjka."""
+    if "year" in df.columns and pd.api.types.is_integer_dtype(df["year"].dtype):
+        df = df.assign(year=df["year"].astype("string").fillna("").astype(str))
+    return df
+
+
+def memory_usage(df, normalized):
+    """Poraba pomnilnika (v bajtih) podatkov in normaliziranih stolpcev, brez indeksov Dataset-a."""
+    return int(df.memory_usage(deep=True).sum() + normalized.memory_usage(deep=True).sum())
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prepare_name(prepare=None):
+    """Oznaka predobdelave za metapodatke posnetka (modul in ime funkcije).
+
+    Predobdelava, vezana na objekt (npr. sources.Source.prepare), se predstavi
+    z njegovim atributom 'schema'.
+    """
+    prepare = prepare or preprocess
+    schema = getattr(getattr(prepare, "__self__", None), "schema", None)
+    return schema or f"{prepare.__module__}.{prepare.__qualname__}"
+
+
+def source_fingerprint(source, sheet, prepare=None):
+    stat = os.stat(source)
+    return {
+        "format": SNAPSHOT_FORMAT, "sheet": sheet, "prepare": prepare_name(prepare),
+        "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+    }
+
+
+def _read_meta(path):
+    try:
+        with open(path + ".json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def temporary_path(path):
+    """Enolično ime začasne datoteke ob `path` (za zapis in nato os.replace).
+
+    Posnetek lahko hkrati gradi več procesov, zato fiksno ime ne zadošča.
+    mkstemp ustvari datoteko z dovoljenji 0600, os.replace pa jih ohrani, zato
+    nastavimo običajna (0666 brez umask), da jo lahko bere tudi drug uporabnik.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    os.chmod(tmp, 0o666 & ~_UMASK)
+    return tmp
+
+
+def _write_meta(path, meta):
+    tmp = temporary_path(path + ".json")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, path + ".json")
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def is_fresh(source=SOURCE, sheet=SHEET, prepare=None):
+    """Ali posnetek ustreza trenutni izvorni datoteki in predobdelavi?
+
+    Če se je spremenil le čas spremembe, vsebina pa ne, posodobimo metapodatke
+    in posnetek obdržimo.
+    """
+    path = snapshot_path(source)
+    meta = _read_meta(path)
+    if meta is None or not os.path.exists(path):
+        return False
+    fingerprint = source_fingerprint(source, sheet, prepare)
+    if all(meta.get(key) == value for key, value in fingerprint.items()):
+        return True
+    if any(meta.get(key) != fingerprint[key] for key in ("format", "sheet", "prepare")):
+        return False
+    if meta.get("sha256") != file_sha256(source):
+        return False
+    _write_meta(path, dict(meta, **fingerprint))
+    return True
+
+
+def snapshot_version(source=SOURCE, sheet=SHEET, prepare=None):
+    """Različica podatkov (SHA-256 izvorne datoteke), če je posnetek svež, sicer None."""
+    if not is_fresh(source, sheet, prepare):
+        return None
+    return _read_meta(snapshot_path(source))["sha256"]
+
+
+def build_snapshot(source=SOURCE, sheet=SHEET, prepare=None):
+    """Prebere Excel datoteko in zapiše posnetek. Vrne (df, normalized)."""
+    fingerprint = dict(source_fingerprint(source, sheet, prepare), sha256=file_sha256(source))
+    df = read_workbook(source, sheet, prepare)
+    normalized = normalize_frame(df)
+    write_snapshot(source, df, normalized, fingerprint)
+    return df, normalized
+
+
+def write_snapshot(source, df, normalized, fingerprint):
+    """Zapiše posnetek in metapodatke (fingerprint) za izvorno datoteko."""
+    table = pa.Table.from_pandas(
+        pd.concat([df, normalized.add_prefix(NORMALIZED_PREFIX)], axis=1),
+        preserve_index=False,
+    )
+    path = snapshot_path(source)
+    tmp = temporary_path(path)
+    try:
+        # Nestisnjen zapis, da ga lahko ob branju preslikamo v pomnilnik
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _write_meta(path, fingerprint)
+
+
+def read_snapshot(source=SOURCE):
+    """Prebere posnetek prek preslikave v pomnilnik. Vrne (df, normalized)."""
+    combined = feather.read_table(snapshot_path(source), memory_map=True).to_pandas()
+    shadow = [col for col in combined.columns if col.startswith(NORMALIZED_PREFIX)]
+    normalized = combined[shadow].rename(columns=lambda col: col[len(NORMALIZED_PREFIX):])
+    return combined.drop(columns=shadow), normalized
+
+
+def load_snapshot(source=SOURCE, sheet=SHEET, compact=False, prepare=None):
+    """Vrne (df, normalized) iz posnetka in ga po potrebi najprej (ponovno) zgradi.
+
+    Z compact=True so ponavljajoči se stolpci kategorije, 'year' pa Int16.
+    `prepare` je predobdelava prebranega lista (privzeto preprocess).
+    Različica podatkov (SHA-256 izvorne datoteke) je v df.attrs["version"], pot do
+    izvorne datoteke pa v df.attrs["source"].
+    """
+    if is_fresh(source, sheet, prepare):
+        df, normalized = read_snapshot(source)
+    else:
+        df, normalized = build_snapshot(source, sheet, prepare)
+    if compact:
+        df, normalized = compact_frame(df, normalized)
+    df.attrs["version"] = _read_meta(snapshot_path(source))["sha256"]
+    df.attrs["source"] = source
+    return df, normalized
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SOURCE
+    sheet = sys.argv[2] if len(sys.argv) > 2 else SHEET
+    df, normalized = build_snapshot(source, sheet)
+    print(f"Posnetek {snapshot_path(source)}: {len(df)} vrstic, {len(df.columns)} stolpcev.")
+    before = memory_usage(df, normalized)
+    after = memory_usage(*compact_frame(df, normalized))
+    print(f"Podatki in senčni stolpci: {before / 1e6:.1f} MB, kompaktno {after / 1e6:.1f} MB ({after / before:.0%}).")
+    print("Brez indeksov; porabo celotnega procesa izmeri python -m benchmarks.bench_memory.")
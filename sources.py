@@ -0,0 +1,221 @@
+"""
+Register virov podatkov in zvezno iskanje po več seznamih hkrati.
+
+Vsak vir (Source) je svoj delček: ima svojo datoteko (vzorec imena), delovni
+list, preslikavo stolpcev v skupno shemo in predobdelavo, svoj posnetek in
+svoje indekse (DatasetWatcher). Poizvedba se v bazenu niti razpošlje vsem
+naloženim delčkom, rezultati pa se združijo s stolpcem 'source' (ime vira).
+
+Delčki se ob zagonu nalagajo v ozadju, v vrstnem redu registra in največ
+toliko hkrati, kot je procesorjev. Vsak delček je na voljo takoj, ko je
+naložen, zato nov vir (dodan na konec registra) ne upočasni zagona obstoječih;
+vir, ki se še nalaga ali se ni uspel naložiti, iskanje izpusti in ga navede v
+stanju.
+
+    federation = Federation(SOURCES).start(wait=True)
+    results = federation.search_frame("Zobec")
+
+    python sources.py Zobec [--column character] [--exact] [--limit 20]
+"""
+import argparse
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from engine import search_rows, to_records
+from query_cache import QueryCache
+from snapshot import SHEET, prepare_name, preprocess
+from watcher import PATTERN, DatasetWatcher
+
+logger = logging.getLogger("maj68.sources")
+
+# Stolpci skupne sheme (kot v izvozu LIST_type=person_<datum>-iskalnik.xlsx)
+COLUMNS = [
+    "#", "title_(year)", "text_id", "author", "publication", "gender", "subtype", "type", "id", "birth",
+    "text_type", "year", "surface", "lemma", "character", "comment", "real_char", "real_link",
+]
+
+# Starejši izvoz (LIST_type=person_search-engine.xlsx, Sheet2) ima imena stolpcev v <...>
+LEGACY_COLUMNS = {
+    "<title> (<year>)": "title_(year)",
+    "<text_id>": "text_id",
+    "<author> (<birth>)": "author",
+    "<publication>": "publication",
+    "<gender>": "gender",
+    "<subtype>": "subtype",
+    "<type>": "type",
+    "<id>": "id",
+    "<birth>": "birth",
+    "<text_type>": "text_type",
+    "<year>": "year",
+    "<surface>": "surface",
+    "<lemma>": "lemma",
+}
+
+
+def preprocess_legacy(df):
+    """Predobdelava starejšega izvoza: avtor brez letnice rojstva, manjkajoči stolpci prazni."""
+    df["author"] = df["author"].str.replace(r"\s*\(\d*\)\s*$", "", regex=True)
+    missing = [col for col in COLUMNS if col not in df.columns]
+    df = df.reindex(columns=COLUMNS)
+    # Prazni stolpci tipa object (ne float), da jih preprocess lahko dopolnjuje; celice ostanejo NaN
+    df[missing] = df[missing].astype(object)
+    return preprocess(df)
+
+
+class Source:
+    """En vir podatkov (delček zveznega iskanja)."""
+
+    def __init__(self, name, label, pattern, sheet=SHEET, columns=None, prepare=preprocess):
+        self.name = name
+        self.label = label
+        self.pattern = pattern
+        self.sheet = sheet
+        self.columns = columns or {}
+        self._prepare = prepare
+
+    @property
+    def schema(self):
+        """Oznaka predobdelave v metapodatkih posnetka (glej snapshot.prepare_name)."""
+        return prepare_name(self._prepare)
+
+    def prepare(self, df):
+        """Preimenuje stolpce v skupno shemo in izvede predobdelavo vira."""
+        return self._prepare(df.rename(columns=self.columns))
+
+    def watcher(self, directory=".", compact=False, interval=60):
+        return DatasetWatcher(directory, self.pattern, self.sheet, compact, interval, prepare=self.prepare)
+
+
+SOURCES = [
+    Source("maj68", "Seznam oseb Maj68", PATTERN),
+    Source(
+        "maj68-starejsi", "Starejši seznam oseb Maj68", "LIST_type=person_search-engine.xlsx", "Sheet2",
+        columns=LEGACY_COLUMNS, prepare=preprocess_legacy,
+    ),
+]
+
+
+class Federation:
+    """Delčki (po en DatasetWatcher za vsak vir) in vzporedno iskanje po njih.
+
+    Že zagnane watcherje (npr. glavnega v api.py) podamo v `watchers`, da se
+    isti vir ne naloži dvakrat. Vsak delček ima svoj QueryCache: predpomnilnik
+    se ob drugi različici podatkov izprazni, zato ga delčki ne smejo deliti.
+    """
+
+    def __init__(self, sources=SOURCES, directory=".", compact=False, interval=60, watchers=None):
+        self.sources = list(sources)
+        self.watchers = dict(watchers or {})
+        for source in self.sources:
+            if source.name not in self.watchers:
+                self.watchers[source.name] = source.watcher(directory, compact, interval)
+        self.caches = {source.name: QueryCache() for source in self.sources}
+        self._errors = {}
+        self._started = threading.Event()
+        self._loader = ThreadPoolExecutor(
+            max_workers=min(len(self.sources), os.cpu_count() or 1), thread_name_prefix="maj68-shard-load",
+        )
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="maj68-shard")
+
+    def _load(self, name):
+        try:
+            self.watchers[name].start()
+        except Exception as error:
+            self._errors[name] = str(error)
+            logger.exception("Vira %s ni bilo mogoče naložiti", name)
+
+    def start(self, wait=False):
+        """Začne nalagati vse še nenaložene delčke (v ozadju); z wait=True počaka nanje."""
+        if not self._started.is_set():
+            self._started.set()
+            futures = [
+                self._loader.submit(self._load, source.name)
+                for source in self.sources if self.watchers[source.name].dataset is None
+            ]
+            if wait:
+                for future in futures:
+                    future.result()
+        return self
+
+    def status(self):
+        """Stanje vsakega vira: ready, loading ali error (z opisom napake)."""
+        status = {}
+        for source in self.sources:
+            dataset = self.watchers[source.name].dataset
+            if dataset is not None:
+                status[source.name] = {"state": "ready", "version": dataset.version, "rows": len(dataset.data)}
+            elif source.name in self._errors:
+                status[source.name] = {"state": "error", "error": self._errors[source.name]}
+            else:
+                status[source.name] = {"state": "loading"}
+        return status
+
+    def search(self, query, column=None, exact=False, distance=None):
+        """Vzporedno iskanje po naloženih delčkih; vrne seznam (vir, Dataset, vrstice) v vrstnem redu registra."""
+        # Dataset vsakega delčka preberemo enkrat, da je odgovor dosleden tudi ob zamenjavi podatkov
+        shards = [(source, self.watchers[source.name].dataset) for source in self.sources]
+        shards = [
+            (source, dataset) for source, dataset in shards
+            if dataset is not None and (column is None or column in dataset.columns)
+        ]
+        futures = [
+            self._executor.submit(search_rows, dataset, query, column, exact, self.caches[source.name], distance)
+            for source, dataset in shards
+        ]
+        return [(source, dataset, future.result()) for (source, dataset), future in zip(shards, futures)]
+
+    def search_frame(self, query, column=None, exact=False, distance=None):
+        """Združeni zadetki vseh delčkov kot DataFrame s stolpcema 'source' in 'row'."""
+        frames = []
+        for source, dataset, rows in self.search(query, column, exact, distance):
+            frame = dataset.frame(rows)[dataset.valid_columns]
+            frames.append(frame.assign(source=source.name, row=rows).reset_index(drop=True))
+        if not frames:
+            return pd.DataFrame(columns=["source", "row"])
+        merged = pd.concat(frames, ignore_index=True)
+        return merged[["source", "row"] + [col for col in merged.columns if col not in ("source", "row")]]
+
+    def search_records(self, query, column=None, exact=False, distance=None, limit=None, fields=None):
+        """(število zadetkov, zapisi za JSON s 'source' in 'row'), največ `limit` zapisov."""
+        results = self.search(query, column, exact, distance)
+        count = sum(len(rows) for _, _, rows in results)
+        records = []
+        for source, dataset, rows in results:
+            if limit is not None:
+                rows = rows[:max(0, limit - len(records))]
+            shard_fields = [col for col in fields if col in dataset.columns] if fields else None
+            for row, record in zip(rows.tolist(), to_records(dataset, rows, shard_fields)):
+                records.append(dict(record, source=source.name, row=row))
+        return count, records
+
+    def stop(self):
+        for watcher in self.watchers.values():
+            watcher.stop()
+        self._loader.shutdown(wait=False)
+        self._executor.shutdown(wait=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("query", help="iskalna poizvedba")
+    parser.add_argument("--column", help="stolpec za iskanje (privzeto globalno iskanje)")
+    parser.add_argument("--exact", action="store_true", help="natančno ujemanje namesto delnega")
+    parser.add_argument("--distance", type=int, help="približno ujemanje z največ toliko napakami (1 ali 2)")
+    parser.add_argument("--limit", type=int, default=20, help="največ toliko prikazanih vrstic")
+    parser.add_argument("--directory", default=".", help="mapa z izvozi")
+    args = parser.parse_args(argv)
+
+    federation = Federation(directory=args.directory, interval=0).start(wait=True)
+    for name, state in federation.status().items():
+        print(f"{name}: {state}")
+    results = federation.search_frame(args.query, args.column, args.exact, args.distance)
+    print(f"Najdenih {len(results)} rezultatov:")
+    print(results.head(args.limit).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Shramba seznama oseb v SQLite kot alternativa DataFrame-u v pomnilniku.
+
+Preobdelani seznam (iz posnetka, glej snapshot.py) zapišemo v tabelo
+'persons': za vsak stolpec vrednost za prikaz (d0, d1, ...) in normalizirano
+"senčno" vrednost (n0, n1, ...), enako kot jo da normalize_string. Senčni
+stolpci imajo indekse B-drevo za natančno ujemanje, nad njimi pa je tabela
+FTS5 s tokenizatorjem trigram (brez pretvorbe velikih črk, saj so vrednosti že
+normalizirane), ki poišče podnize dolžine vsaj 3 znake. Krajše poizvedbe
+preverimo z instr() po senčnih stolpcih. Rezultati so enaki kot pri iskanju v
+pomnilniku (engine.match_rows): številke vrstic so rowid, urejene naraščajoče.
+
+Datoteko si lahko deli več procesov (npr. delavci paketnega iskanja); vsak jo
+odpre samo za branje, strani pa so v skupnem predpomnilniku operacijskega
+sistema, zato posamezen proces ne hrani celotne tabele.
+
+    dataset = load_sqlite(SOURCE, SHEET)
+    results = search_data(dataset, "Zobec", column="character", exact=True)
+
+Bazo lahko zgradimo tudi vnaprej:
+
+    python sqlite_backend.py [pot/do/datoteke.xlsx] [ime_lista]
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from engine import valid_columns
+from snapshot import SHEET, SOURCE, load_snapshot, snapshot_version, temporary_path
+
+# Poizvedbe, krajše od trigrama, FTS5 ne more poiskati v indeksu
+MIN_FTS_LENGTH = 3
+
+
+def database_path(source):
+    """Pot do baze SQLite, ki pripada izvorni datoteki."""
+    return os.path.splitext(source)[0] + ".sqlite"
+
+
+def _python_value(value):
+    """Vrednost celice za SQLite (prazne celice kot NULL)."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def build_database(source=SOURCE, sheet=SHEET, path=None):
+    """Zgradi bazo iz (po potrebi osveženega) posnetka. Vrne pot do baze."""
+    path = path or database_path(source)
+    data, normalized = load_snapshot(source, sheet)
+    # Enolično ime, ker lahko bazo hkrati gradi več procesov; prazno datoteko SQLite sprejme
+    tmp = temporary_path(path)
+    try:
+        _write_database(tmp, source, sheet, data, normalized)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def _write_database(tmp, source, sheet, data, normalized):
+    columns = list(data.columns)
+    display = [f"d{i}" for i in range(len(columns))]
+    shadow = [f"n{i}" for i in range(len(columns))]
+    connection = sqlite3.connect(tmp)
+    try:
+        connection.execute(
+            f"CREATE TABLE persons (rowid INTEGER PRIMARY KEY, {', '.join(display + shadow)})"
+        )
+        values = zip(
+            range(len(data)),
+            *([_python_value(v) for v in data[col]] for col in columns),
+            *(normalized[col].tolist() for col in columns),
+        )
+        connection.executemany(
+            f"INSERT INTO persons VALUES ({', '.join('?' * (1 + 2 * len(columns)))})", values
+        )
+        for name in shadow:
+            connection.execute(f"CREATE INDEX persons_{name} ON persons ({name})")
+        connection.execute(
+            f"CREATE VIRTUAL TABLE persons_fts USING fts5({', '.join(shadow)}, "
+            "content='persons', content_rowid='rowid', tokenize='trigram case_sensitive 1')"
+        )
+        connection.execute("INSERT INTO persons_fts (persons_fts) VALUES ('rebuild')")
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", data.attrs["version"]),
+            ("source", source),
+            ("sheet", sheet),
+            ("columns", json.dumps(columns, ensure_ascii=False)),
+        ])
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def _readonly_uri(path):
+    """URI za odpiranje samo za branje; znaki, kot so '?', '#' in '%', so v poti kodirani."""
+    return f"file:{quote(path)}?mode=ro"
+
+
+def _read_meta(path):
+    try:
+        connection = sqlite3.connect(_readonly_uri(path), uri=True)
+    except sqlite3.Error:
+        return None
+    try:
+        return dict(connection.execute("SELECT key, value FROM meta"))
+    except sqlite3.Error:
+        return None
+    finally:
+        connection.close()
+
+
+def _fts_phrase(normalized_query):
+    # Niz v dvojnih narekovajih je v FTS5 fraza; trigrami fraze se morajo pojaviti zaporedno
+    return '"' + normalized_query.replace('"', '""') + '"'
+
+
+class SqliteDataset:
+    """Seznam oseb v bazi SQLite z enakim iskalnim vmesnikom kot engine.Dataset.
+
+    Atributi:
+        version (str): različica podatkov (SHA-256 izvorne datoteke).
+        source (str): izvorna datoteka .xlsx.
+        columns (list): vsi stolpci.
+        valid_columns (list): stolpci, ki jih prikazujemo in po katerih lahko iščemo.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        meta = _read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"Baza {path!r} ne obstaja ali ni popolna")
+        self.version = meta["version"]
+        self.source = meta["source"]
+        self.columns = json.loads(meta["columns"])
+        self.valid_columns = valid_columns(pd.DataFrame(columns=self.columns))
+        self._positions = {col: i for i, col in enumerate(self.columns)}
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """Povezava samo za branje (ena na nit)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(_readonly_uri(self.path), uri=True, check_same_thread=False)
+            self._local.connection = connection
+        return connection
+
+    def _rows(self, sql, parameters=()):
+        return np.fromiter((row for row, in self.connection.execute(sql, parameters)), dtype=np.int32)
+
+    def match_rows(self, normalized_query, column=None, exact=False, distance=None):
+        """Številke ujemajočih se vrstic (urejene), enako kot engine.match_rows."""
+        if distance is not None:
+            raise ValueError("Približno ujemanje v bazi SQLite ni podprto.")
+        positions = [self._positions[column]] if column else range(len(self.columns))
+        # Pri iskanju v stolpcu se prazne celice (senčna vrednost "nan") nikoli ne ujemajo
+        present = f" AND d{positions[0]} IS NOT NULL" if column else ""
+        if exact:
+            # Vsak stolpec je en vpogled v indeks; UNION odstrani ponovitve
+            sql = " UNION ".join(f"SELECT rowid FROM persons WHERE n{i} = ?{present}" for i in positions)
+            return self._rows(sql + " ORDER BY rowid", [normalized_query] * len(positions))
+        if len(normalized_query) >= MIN_FTS_LENGTH:
+            phrase = _fts_phrase(normalized_query)
+            if column:
+                phrase = f"n{positions[0]} : {phrase}"
+            return self._rows(
+                "SELECT persons.rowid FROM persons_fts JOIN persons ON persons.rowid = persons_fts.rowid "
+                f"WHERE persons_fts MATCH ?{present} ORDER BY persons.rowid",
+                [phrase],
+            )
+        condition = " OR ".join(f"instr(n{i}, ?) > 0" for i in positions)
+        return self._rows(
+            f"SELECT rowid FROM persons WHERE ({condition}){present} ORDER BY rowid",
+            [normalized_query] * len(positions),
+        )
+
+    def frame(self, rows):
+        """Vrstice `rows` (v tem vrstnem redu) kot DataFrame s stolpci za prikaz."""
+        rows = [int(row) for row in rows]
+        display = ", ".join(f"persons.d{i}" for i in range(len(self.columns)))
+        records = self.connection.execute(
+            f"SELECT {display} FROM json_each(?) AS wanted JOIN persons ON persons.rowid = wanted.value "
+            "ORDER BY wanted.key",
+            [json.dumps(rows)],
+        ).fetchall()
+        return pd.DataFrame.from_records(records, columns=self.columns, index=pd.Index(rows))
+
+
+def load_sqlite(source=SOURCE, sheet=SHEET, path=None):
+    """Odpre bazo za izvorno datoteko in jo po potrebi najprej (ponovno) zgradi."""
+    path = path or database_path(source)
+    meta = _read_meta(path) if os.path.exists(path) else None
+    version = snapshot_version(source, sheet)
+    if meta is None or version is None or meta.get("version") != version or meta.get("sheet") != sheet:
+        build_database(source, sheet, path)
+    return SqliteDataset(path)
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else SOURCE
+    sheet = sys.argv[2] if len(sys.argv) > 2 else SHEET
+    path = build_database(source, sheet)
+    dataset = SqliteDataset(path)
+    print(f"Baza {path}: {len(dataset.columns)} stolpcev, {os.path.getsize(path) / 1e6:.1f} MB.")
@@ -0,0 +1,74 @@
+"""
+refine_search med tipkanjem vrne iste vrstice kot iskanje po vseh podatkih.
+
+    pytest
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import engine
+from benchmarks.synthetic import generate
+from engine import Dataset, match_rows, refine_search
+from normalization import normalize_string
+from snapshot import normalize_frame, preprocess
+
+# Stolpci, iz katerih vzorčimo vrednosti, in stolpci za iskanje po polju (None: globalno)
+QUERY_COLUMNS = ["character", "lemma", "surface", "author", "title_(year)"]
+FIELD_COLUMNS = [None, "character", "author", "title_(year)"]
+
+
+def typing_chains(df, count, seed):
+    """Zaporedja poizvedb med tipkanjem: dodajanje znakov, brisanje zadnjega znaka in pisanje na začetek."""
+    rng = np.random.default_rng(seed)
+    values = [value for value in pd.unique(df[QUERY_COLUMNS].astype(str).to_numpy().ravel()) if value != "nan"]
+    chains = []
+    for value in rng.choice(values, size=count):
+        value = value[:12]
+        chain = [value[:i] for i in range(1, len(value) + 1)]
+        if len(value) > 2:
+            chain += [value[:-1], value, value[1:], value]
+        chains.append(chain)
+    return chains
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    df = preprocess(generate(3000, seed=7))
+    df.attrs["version"] = "synthetic-3000"
+    return Dataset(df, normalize_frame(df))
+
+
+@pytest.fixture(scope="module")
+def chains(dataset):
+    return typing_chains(dataset.data, 40, seed=7)
+
+
+def assert_chains_equal(dataset, chains, column):
+    for chain in chains:
+        previous = None
+        for query in chain:
+            state = refine_search(dataset, query, column, previous)
+            expected = match_rows(dataset, normalize_string(query), column)
+            assert np.array_equal(state["rows"], expected), (query, column, previous and previous["query"])
+            previous = state
+
+
+@pytest.mark.parametrize("column", FIELD_COLUMNS)
+def test_typing_chains(dataset, chains, column):
+    assert_chains_equal(dataset, chains, column)
+
+
+@pytest.mark.parametrize("column", FIELD_COLUMNS)
+def test_typing_chains_with_postings(dataset, chains, column, monkeypatch):
+    # Pri vsakem nadaljevanju namesto pregleda prejšnjih vrednosti uporabimo presek posting list
+    monkeypatch.setattr(engine, "REFINE_MAX_VALUES", 0)
+    assert_chains_equal(dataset, chains, column)
+
+
+def test_previous_from_other_column_or_version(dataset):
+    previous = refine_search(dataset, "an", "character")
+    expected = match_rows(dataset, "ana", "author")
+    assert np.array_equal(refine_search(dataset, "ana", "author", previous)["rows"], expected)
+    stale = dict(refine_search(dataset, "an"), version="druga-razlicica", rows=np.zeros(0, dtype=np.int32))
+    assert np.array_equal(refine_search(dataset, "ana", None, stale)["rows"], match_rows(dataset, "ana"))
@@ -0,0 +1,97 @@
+"""
+Merjenje časa posameznih faz izvajanja (nalaganje, iskanje, prikaz ...).
+
+Timer meri faze enega izvajanja skripte z `with timer.span("ime"):` in jih ob
+koncu z emit() zapiše kot eno vrstico JSON v dnevnik "maj68.timing" ter doda v
+StageStats, ki hrani zadnje meritve vsake faze v pomnilniku procesa (p50, p95).
+Izklopljen Timer (enabled=False) ne meri ničesar: span() vrne vnaprej
+pripravljen prazen kontekst, emit() pa ne naredi ničesar.
+
+    timer = Timer(enabled=True)
+    with timer.span("search"):
+        ...
+    timer.emit(stats, column="character")
+"""
+import contextlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("maj68.timing")
+if not logger.handlers:
+    # Vrstice izpišemo ne glede na nastavitve korenskega dnevnika (Streamlit ga nastavi po svoje)
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def percentile(ordered, fraction):
+    """Vrednost pri deležu `fraction` urejenega seznama (najbližji rang)."""
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class StageStats:
+    """Zadnjih `window` meritev vsake faze (v ms), skupno vsem sejam v procesu."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, stages):
+        with self._lock:
+            for name, ms in stages.items():
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = deque(maxlen=self.window)
+                samples.append(ms)
+
+    def summary(self):
+        """{faza: {"n", "p50_ms", "p95_ms"}} v vrstnem redu prve meritve."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        return {
+            name: {"n": len(ordered), "p50_ms": percentile(ordered, 0.5), "p95_ms": percentile(ordered, 0.95)}
+            for name, ordered in snapshot.items()
+        }
+
+
+class Timer:
+    """Časi faz enega izvajanja (v ms, v vrstnem redu začetka)."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1e3
+
+    def emit(self, stats=None, **fields):
+        """Doda skupni čas, zapiše vrstico v dnevnik in meritve doda v `stats`."""
+        if not self.enabled:
+            return
+        self.stages["total"] = (time.perf_counter() - self._start) * 1e3
+        if stats is not None:
+            stats.record(self.stages)
+        record = dict(fields, stages={name: round(ms, 3) for name, ms in self.stages.items()})
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+NULL_TIMER = Timer(enabled=False)
@@ -0,0 +1,108 @@
+"""
+Samodejno nalaganje novih ali spremenjenih izvozov seznama oseb.
+
+DatasetWatcher v mapi poišče najnovejšo datoteko LIST_type=person_<datum>-iskalnik.xlsx
+(po datumu v imenu) in jo naloži. Nit v ozadju jo vsakih `interval` sekund
+preveri (pot, čas spremembe, velikost); ko se pojavi novejša datoteka ali se
+obstoječa spremeni, v ozadju zgradi nov Dataset z vsemi indeksi in ga nato z
+eno samo prireditvijo zamenja s starim. Seje, ki že tečejo, obdržijo svoj
+Dataset do konca izvajanja in nikoli ne čakajo na ponovno gradnjo. Ob prvem
+nalaganju je Dataset na voljo takoj, ko so zgrajeni iskalni indeksi; indeks za
+približno ujemanje, predloge in entitete se zgradijo v ozadju. Če gradnja
+spodleti (npr. datoteka se še kopira), ostane v uporabi stari Dataset, poskus
+pa se ponovi ob naslednjem preverjanju.
+
+    watcher = DatasetWatcher(".", interval=60)
+    watcher.start()
+    dataset = watcher.dataset
+"""
+import glob
+import logging
+import os
+import threading
+
+from engine import load_dataset
+from snapshot import SHEET
+from timing import NULL_TIMER
+
+logger = logging.getLogger("maj68.watcher")
+
+PATTERN = "LIST_type=person_*-iskalnik.xlsx"
+
+
+def latest_source(directory=".", pattern=PATTERN):
+    """Pot do najnovejšega izvoza (datum v imenu je oblike LLLL-MM-DD) ali None."""
+    paths = glob.glob(os.path.join(glob.escape(directory), pattern))
+    return max(paths, key=os.path.basename) if paths else None
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+class DatasetWatcher:
+    def __init__(self, directory=".", pattern=PATTERN, sheet=SHEET, compact=False, interval=60, prepare=None):
+        self.directory = directory
+        self.pattern = pattern
+        self.sheet = sheet
+        self.compact = compact
+        self.interval = interval
+        # Predobdelava lista (None: snapshot.preprocess), glej sources.py
+        self.prepare = prepare
+        self._dataset = None
+        self._loaded = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def dataset(self):
+        """Trenutno aktivni Dataset (seja naj ga prebere enkrat na izvajanje)."""
+        return self._dataset
+
+    def start(self, timer=NULL_TIMER):
+        """Naloži najnovejši izvoz (sinhrono) in zažene preverjanje v ozadju (če interval > 0)."""
+        source = latest_source(self.directory, self.pattern)
+        if source is None:
+            raise FileNotFoundError(f"V mapi {self.directory!r} ni datoteke {self.pattern}")
+        self._load(source, timer, warm=False)
+        threading.Thread(target=self._warm, args=(self._dataset,), name="maj68-warm", daemon=True).start()
+        if self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="maj68-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        """Ponovno naloži podatke, če se je izvoz spremenil. Vrne True ob zamenjavi."""
+        source = latest_source(self.directory, self.pattern)
+        if source is None or _fingerprint(source) == self._loaded:
+            return False
+        self._load(source)
+        return True
+
+    @staticmethod
+    def _warm(dataset):
+        # Lene strukture, ki jih sicer zgradi prva seja, ki jih potrebuje (predloge so potrebne najprej).
+        # Dataset jih zaklene, zato jih seja, ki jih potrebuje med gradnjo, ne gradi še enkrat.
+        dataset.autocomplete
+        dataset.entities
+        dataset.fuzzy_index
+
+    def _load(self, source, timer=NULL_TIMER, warm=True):
+        fingerprint = _fingerprint(source)
+        dataset = load_dataset(source, self.sheet, compact=self.compact, timer=timer, prepare=self.prepare)
+        if warm:
+            # Ob ponovnem nalaganju jih zgradimo še pred zamenjavo, da jih nobena seja ne gradi sama
+            self._warm(dataset)
+        self._dataset, self._loaded = dataset, fingerprint
+        logger.info("Naložen %s (različica %s)", os.path.basename(source), dataset.version)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Ponovno nalaganje ni uspelo; ostaja prejšnja različica podatkov")